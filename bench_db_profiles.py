@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+from database import create_db_pool, bulk_merge
+from update_movie_provider import MOVIE_COLUMNS
+
+# 연결 프로필(pooler/direct)별 자주 쓰는 쿼리 지연 시간 비교
+# 사용법: python bench_db_profiles.py --iterations 200 --profiles pooler direct
+# direct 프로필은 DB_HOST/DB_PORT가 PgBouncer가 아닌 Postgres를 가리킬 때만 의미가 있다
+# 업서트는 트랜잭션 안에서 실행한 뒤 롤백하므로 데이터는 바뀌지 않는다
+
+async def time_query(iterations: int, run: Callable[[], Awaitable[Any]]) -> Dict[str, float]:
+    durations: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await run()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return {
+        "mean": statistics.mean(durations) * 1000,
+        "p50": durations[len(durations) // 2] * 1000,
+        "p95": durations[int(len(durations) * 0.95) - 1] * 1000
+    }
+
+async def bench_profile(profile: str, iterations: int, sample_size: int) -> Dict[str, Dict[str, float]]:
+    pool = await create_db_pool(profile)
+    try:
+        async with pool.acquire() as conn:
+            titles = [row['normalized_title'] for row in await conn.fetch(
+                "SELECT normalized_title FROM movie WHERE normalized_title IS NOT NULL LIMIT $1", sample_size
+            )]
+            theater_names = [row['name'] for row in await conn.fetch("SELECT name FROM theaters")]
+            movie_rows = [tuple(row) for row in await conn.fetch(
+                f"SELECT {', '.join(MOVIE_COLUMNS)} FROM movie LIMIT $1", sample_size
+            )]
+
+            async def title_lookup():
+                await conn.fetch("SELECT normalized_title FROM movie WHERE normalized_title = ANY($1)", titles)
+
+            async def theater_lookup():
+                await conn.fetch("SELECT id, name FROM theaters WHERE name = ANY($1)", theater_names)
+
+            async def movie_upsert():
+                transaction = conn.transaction()
+                await transaction.start()
+                try:
+                    await bulk_merge(
+                        conn, 'movie', MOVIE_COLUMNS, movie_rows,
+                        conflict_keys=['the_movie_db_id'],
+                        update_columns=MOVIE_COLUMNS[1:],
+                        update_where='movie.content_hash IS DISTINCT FROM EXCLUDED.content_hash'
+                    )
+                finally:
+                    await transaction.rollback()
+
+            return {
+                "title = ANY": await time_query(iterations, title_lookup),
+                "theater lookup": await time_query(iterations, theater_lookup),
+                "movie upsert": await time_query(iterations, movie_upsert)
+            }
+    finally:
+        await pool.close()
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--sample-size', type=int, default=200)
+    parser.add_argument('--profiles', nargs='+', default=['pooler', 'direct'])
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        results = await bench_profile(profile, args.iterations, args.sample_size)
+        print(f"[{profile}] iterations={args.iterations} sample={args.sample_size}")
+        for name, stats in results.items():
+            print(f"  {name:<15} mean {stats['mean']:.2f}ms  p50 {stats['p50']:.2f}ms  p95 {stats['p95']:.2f}ms")
+
+if __name__ == '__main__':
+    asyncio.run(main())
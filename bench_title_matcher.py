@@ -0,0 +1,75 @@
+import argparse
+import random
+import string
+import time
+from typing import Any, Dict, List
+from title_matcher import TitleMatcher
+
+# 넷플릭스 만료 예정 영화와 netflix_horror_en 제목 매칭 마이크로벤치마크
+# 사용법: python bench_title_matcher.py --expiring 10000 --horror 50000
+
+def make_words(count: int, rng: random.Random) -> List[str]:
+    return [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(count)]
+
+def make_horror_movies(count: int, words: List[str], rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            'title': ' '.join(rng.choices(words, k=rng.randint(1, 5))).title(),
+            'release_year': rng.randint(1950, 2024),
+            'the_movie_db_id': i
+        }
+        for i in range(count)
+    ]
+
+def make_expiring_movies(count: int, horror_movies: List[Dict[str, Any]], words: List[str], rng: random.Random) -> List[Dict[str, str]]:
+    expiring = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            expiring.append({'title': rng.choice(horror_movies)['title'].upper(), 'expired_date': '2026-12-31'})
+        else:
+            expiring.append({'title': ' '.join(rng.choices(words, k=rng.randint(1, 4))), 'expired_date': '2026-12-31'})
+    return expiring
+
+def naive_match(expiring_movies: List[Dict[str, str]], horror_movies: List[Dict[str, Any]]) -> int:
+    matched = 0
+    for expiring_movie in expiring_movies:
+        for horror_movie in horror_movies:
+            if expiring_movie['title'].lower() in horror_movie['title'].lower():
+                matched += 1
+                break
+    return matched
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--expiring', type=int, default=10000)
+    parser.add_argument('--horror', type=int, default=50000)
+    parser.add_argument('--naive-sample', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words = make_words(5000, rng)
+    horror_movies = make_horror_movies(args.horror, words, rng)
+    expiring_movies = make_expiring_movies(args.expiring, horror_movies, words, rng)
+
+    start = time.perf_counter()
+    matcher = TitleMatcher(horror_movies)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matched = sum(1 for movie in expiring_movies if matcher.match(movie['title']))
+    query_time = time.perf_counter() - start
+
+    sample = expiring_movies[:args.naive_sample]
+    start = time.perf_counter()
+    naive_matched = naive_match(sample, horror_movies)
+    naive_time = time.perf_counter() - start
+    naive_estimate = naive_time * len(expiring_movies) / max(len(sample), 1)
+
+    print(f"expiring={args.expiring} horror={args.horror}")
+    print(f"matcher build: {build_time:.3f}s")
+    print(f"matcher query: {query_time:.3f}s ({query_time / len(expiring_movies) * 1e6:.1f}us/title, {matched} matched)")
+    print(f"naive nested loop: {naive_time:.3f}s for {len(sample)} titles ({naive_matched} matched), "
+          f"~{naive_estimate:.1f}s estimated for all")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+from logging_config import get_logger
+from config import CHECKPOINT_WINDOW_HOURS
+
+logger = get_logger(__name__)
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex
+
+def dump_payload(payload: Any) -> str:
+    return json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+def payload_hash(payload_json: str) -> str:
+    return hashlib.sha256(payload_json.encode('utf-8')).hexdigest()
+
+# 단계별 결과(스크래핑한 제목, 공급자별 영화 목록 등)를 stage_checkpoints 테이블에 저장
+# 실패한 실행을 window 안에 다시 시도하면 저장된 단계는 건너뛰고 남은 단계만 실행한다
+# 단계가 끝까지 반영되면 clear()로 지워서 다음 정기 실행이 예전 결과를 쓰지 않게 한다
+# 큰 결과는 "단계:번호" 하위 단계로 나눠 저장하고, run_id를 지정해 같은 실행의 조각만 읽는다
+class CheckpointStore:
+    def __init__(self, pool, run_id: Optional[str] = None, window_hours: float = CHECKPOINT_WINDOW_HOURS):
+        self.pool = pool
+        self.run_id = run_id or new_run_id()
+        self.window = timedelta(hours=window_hours)
+
+    async def save(self, stage: str, payload: Any) -> None:
+        payload_json = dump_payload(payload)
+        async with self.pool.acquire() as conn:
+            await conn.execute('''
+                INSERT INTO stage_checkpoints (run_id, stage, content_hash, payload, created_at)
+                VALUES ($1, $2, $3, $4::jsonb, now())
+                ON CONFLICT (run_id, stage) DO UPDATE
+                SET content_hash = EXCLUDED.content_hash,
+                    payload = EXCLUDED.payload,
+                    created_at = EXCLUDED.created_at
+            ''', self.run_id, stage, payload_hash(payload_json), payload_json)
+        logger.info(f"체크포인트 저장: {stage} (run_id: {self.run_id})")
+
+    async def load(self, stage: str, run_id: Optional[str] = None) -> Optional[Any]:
+        since = datetime.now(timezone.utc) - self.window
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow('''
+                SELECT run_id, content_hash, payload::text AS payload
+                FROM stage_checkpoints
+                WHERE stage = $1 AND created_at >= $2 AND ($3::text IS NULL OR run_id = $3)
+                ORDER BY created_at DESC
+                LIMIT 1
+            ''', stage, since, run_id)
+        if not row:
+            return None
+        payload = json.loads(row['payload'])
+        if payload_hash(dump_payload(payload)) != row['content_hash']:
+            logger.warning(f"체크포인트 해시 불일치. 무시합니다: {stage} (run_id: {row['run_id']})")
+            return None
+        logger.info(f"체크포인트에서 재개: {stage} (run_id: {row['run_id']})")
+        return payload
+
+    # 하위 단계("단계:번호")도 함께 지운다
+    async def clear(self, stages: List[str]) -> None:
+        async with self.pool.acquire() as conn:
+            await conn.execute('''
+                DELETE FROM stage_checkpoints
+                WHERE stage = ANY($1::text[])
+                   OR EXISTS (SELECT 1 FROM unnest($1::text[]) AS s(stage) WHERE stage_checkpoints.stage LIKE s.stage || ':%')
+            ''', stages)
+
+    async def prune(self) -> None:
+        since = datetime.now(timezone.utc) - self.window
+        async with self.pool.acquire() as conn:
+            await conn.execute("DELETE FROM stage_checkpoints WHERE created_at < $1", since)
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, List, Optional
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException, TimeoutException
+from logging_config import get_logger
+from config import DRIVER_POOL_SIZE, DRIVER_MAX_USES
+
+logger = get_logger(__name__)
+
+def setup_chrome_driver() -> webdriver.Chrome:
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--ignore-certificate-errors')
+    chrome_options.add_argument('--ignore-ssl-errors')
+    return webdriver.Chrome(options=chrome_options)
+
+class PooledDriver:
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+
+# 스크래퍼들이 공유하는 크롬 드라이버 풀
+# 체크아웃 시 드라이버 상태를 확인하고, max_uses 회 사용된 드라이버는 새 드라이버로 교체한다
+class DriverPool:
+    def __init__(self, size: int = DRIVER_POOL_SIZE, max_uses: int = DRIVER_MAX_USES,
+                 factory: Callable[[], webdriver.Chrome] = setup_chrome_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self._factory = factory
+        self._idle: List[PooledDriver] = []
+        self._semaphore = asyncio.Semaphore(size)
+        self._created_count = 0
+        self._closed = False
+
+    async def _create(self) -> PooledDriver:
+        driver = await asyncio.to_thread(self._factory)
+        self._created_count += 1
+        logger.info(f"크롬 드라이버 생성 (누적 생성 수: {self._created_count})")
+        return PooledDriver(driver)
+
+    async def _quit(self, pooled: PooledDriver) -> None:
+        try:
+            await asyncio.to_thread(pooled.driver.quit)
+        except Exception as e:
+            logger.warning(f"크롬 드라이버 종료 중 오류 발생: {e}")
+
+    async def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            await asyncio.to_thread(lambda: pooled.driver.current_url)
+            return True
+        except Exception as e:
+            logger.warning(f"크롬 드라이버 상태 확인 실패: {e}")
+            return False
+
+    async def checkout(self) -> PooledDriver:
+        if self._closed:
+            raise RuntimeError("드라이버 풀이 이미 종료되었습니다.")
+        await self._semaphore.acquire()
+        try:
+            while self._idle:
+                pooled = self._idle.pop()
+                if pooled.uses < self.max_uses and await self._is_healthy(pooled):
+                    return pooled
+                await self._quit(pooled)
+            return await self._create()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def checkin(self, pooled: PooledDriver, healthy: bool = True) -> None:
+        try:
+            pooled.uses += 1
+            if self._closed or not healthy or pooled.uses >= self.max_uses:
+                await self._quit(pooled)
+            else:
+                self._idle.append(pooled)
+        finally:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def driver(self):
+        pooled = await self.checkout()
+        healthy = True
+        try:
+            yield pooled.driver
+        except TimeoutException:
+            # 요소 대기 시간 초과는 드라이버 자체의 문제가 아니므로 재사용한다
+            raise
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            await self.checkin(pooled, healthy)
+
+    async def close(self) -> None:
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._quit(pooled)
+        logger.info(f"드라이버 풀 종료 완료 (총 생성된 드라이버 수: {self._created_count})")
+
+driver_pool: Optional[DriverPool] = None
+
+def get_driver_pool() -> DriverPool:
+    global driver_pool
+    if not driver_pool:
+        driver_pool = DriverPool()
+    return driver_pool
+
+async def close_driver_pool() -> None:
+    global driver_pool
+    if driver_pool:
+        await driver_pool.close()
+        driver_pool = None
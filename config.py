@@ -27,6 +27,14 @@ DB_CONFIG = {
 
 DB_DSN = f"postgresql://{DB_USER}:{urllib.parse.quote_plus(DB_PASSWORD)}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# 연결 프로필: pooler(PgBouncer 트랜잭션 모드, prepared statement 사용 안 함) / direct(Postgres 직접 연결)
+DB_CONNECTION_PROFILE = os.getenv('DB_CONNECTION_PROFILE', 'pooler').lower()
+# direct 프로필에서만 사용
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_POOL_MAX_INACTIVE_LIFETIME = float(os.getenv('DB_POOL_MAX_INACTIVE_LIFETIME', '300'))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '100'))
+
 # 영화 공급자 ID 매핑
 PROVIDER_MAPPING = {
     8: 1,  # 넷플릭스
@@ -45,7 +53,9 @@ HEADERS = {
 # UNOGS 정보
 UNOGS_URL = os.getenv('UNOGS_URL')
 WAIT_TIME = os.getenv('WAIT_TIME')
-EXPIRING_BUTTON_INDEX = os.getenv('EXPIRING_BUTTON_INDEX')
+EXPIRING_BUTTON_INDEX = int(os.getenv('EXPIRING_BUTTON_INDEX', '0'))
+UNOGS_NEXT_PAGE_SELECTOR = os.getenv('UNOGS_NEXT_PAGE_SELECTOR', 'li.page-item:not(.disabled) > a[aria-label="Next"]')
+UNOGS_MAX_PAGES = int(os.getenv('UNOGS_MAX_PAGES', '30'))
 
 # 영화 정보 스크래핑 정보
 CGV_RELEASED_URL = os.getenv('CGV_RELEASED_URL')
@@ -68,3 +78,83 @@ UPCOMING_SELECTOR = 'strong.tit_info'
 TIMEOUT = os.getenv('TIMEOUT')
 
 MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', '5'))
+
+# 크롬 드라이버 풀
+DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '2'))
+DRIVER_MAX_USES = int(os.getenv('DRIVER_MAX_USES', '20'))
+
+# HTTP 스크래핑 (실패하거나 결과가 없으면 셀레니움으로 재시도)
+HTTP_SCRAPER_ENABLED = os.getenv('HTTP_SCRAPER_ENABLED', 'true').lower() == 'true'
+HTTP_SCRAPER_TIMEOUT = int(os.getenv('HTTP_SCRAPER_TIMEOUT', '20'))
+HTTP_SCRAPER_MAX_PAGES = int(os.getenv('HTTP_SCRAPER_MAX_PAGES', '20'))  # JSON API 목록을 끝까지 받을 때 최대 페이지 수
+CGV_TITLE_SELECTOR = 'strong.title'
+MEGABOX_MOVIE_API_URL = os.getenv('MEGABOX_MOVIE_API_URL')
+LOTTE_MOVIE_API_URL = os.getenv('LOTTE_MOVIE_API_URL')
+
+# 영화관별 상영작/개봉 예정작 목록 동시 조회 수
+CHAIN_CONCURRENCY = int(os.getenv('CHAIN_CONCURRENCY', '2'))
+
+# 더보기 페이지네이션
+PAGINATION_SETTLE_TIMEOUT = float(os.getenv('PAGINATION_SETTLE_TIMEOUT', '5'))
+PAGINATION_MAX_CLICKS = int(os.getenv('PAGINATION_MAX_CLICKS', '50'))
+
+# 페이지 로딩 대기 (page_waits): 요청/DOM 변경이 이 시간(ms) 동안 없으면 로딩이 끝난 것으로 본다
+PAGE_SETTLE_QUIET_MS = int(os.getenv('PAGE_SETTLE_QUIET_MS', '300'))
+PAGE_SETTLE_TIMEOUT = float(os.getenv('PAGE_SETTLE_TIMEOUT', '5'))
+
+# 제목 매칭 (pg_trgm 확장이 있으면 정확히 일치하지 않는 제목을 유사도로 찾는다)
+TITLE_TRGM_FALLBACK = os.getenv('TITLE_TRGM_FALLBACK', 'false').lower() == 'true'
+TITLE_TRGM_THRESHOLD = float(os.getenv('TITLE_TRGM_THRESHOLD', '0.6'))
+
+# TMDB API 클라이언트
+TMDB_API_ROOT = os.getenv('TMDB_API_ROOT', 'https://api.themoviedb.org/3')
+TMDB_RATE_LIMIT = float(os.getenv('TMDB_RATE_LIMIT', '20'))  # 초당 요청 수
+TMDB_RATE_BURST = int(os.getenv('TMDB_RATE_BURST', '20'))
+TMDB_MAX_RETRIES = int(os.getenv('TMDB_MAX_RETRIES', '3'))
+TMDB_REQUEST_TIMEOUT = int(os.getenv('TMDB_REQUEST_TIMEOUT', '30'))
+
+# TMDB 응답 캐시 (조건부 요청용 SQLite 캐시)
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH', 'http_cache.sqlite3')
+HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', str(100 * 1024 * 1024)))
+
+# 공급자 정보 동기화 (auto: 변경 피드로 증분 동기화, 주기마다 전체 동기화 / full: 항상 전체 동기화)
+PROVIDER_SYNC_MODE = os.getenv('PROVIDER_SYNC_MODE', 'auto')
+PROVIDER_FULL_SYNC_DAYS = int(os.getenv('PROVIDER_FULL_SYNC_DAYS', '28'))
+TMDB_CHANGES_MAX_DAYS = 14  # TMDB 변경 피드가 한 번에 조회할 수 있는 최대 기간
+WATCH_REGION = 'KR'
+
+# 공급자 영화 스트리밍 파이프라인 (조회한 페이지를 바로 COPY)
+PIPELINE_BATCH_SIZE = int(os.getenv('PIPELINE_BATCH_SIZE', '500'))
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '4'))
+
+# database.bulk_merge 한 번에 COPY/병합하는 행 수
+BULK_MERGE_CHUNK_SIZE = int(os.getenv('BULK_MERGE_CHUNK_SIZE', '5000'))
+
+# 주간 업데이트 DAG의 작업 종류별 동시 실행 수
+DAG_BROWSER_CONCURRENCY = int(os.getenv('DAG_BROWSER_CONCURRENCY', '2'))
+DAG_HTTP_CONCURRENCY = int(os.getenv('DAG_HTTP_CONCURRENCY', '2'))
+DAG_DB_CONCURRENCY = int(os.getenv('DAG_DB_CONCURRENCY', '2'))
+
+# 작업별 실행 주기(시간). 마지막 성공 후 이 시간이 지나지 않았으면 건너뛴다
+# 영화관 정보/상영 종료 업데이트는 scrape 작업이 실행될 때 함께 실행된다
+JOB_INTERVAL_HOURS = {
+    'scrape': float(os.getenv('JOB_INTERVAL_SCRAPE_HOURS', '168')),
+    'netflix': float(os.getenv('JOB_INTERVAL_NETFLIX_HOURS', '48')),
+    'upcoming': float(os.getenv('JOB_INTERVAL_UPCOMING_HOURS', '24')),
+    'providers': float(os.getenv('JOB_INTERVAL_PROVIDERS_HOURS', '168')),
+}
+JOB_RETRY_DELAY = int(os.getenv('JOB_RETRY_DELAY', '3600'))  # 실패한 작업 재시도 간격(초)
+JOB_CATCHUP_JITTER = int(os.getenv('JOB_CATCHUP_JITTER', '600'))  # 재시작 후 밀린 작업 실행 전 최대 대기(초)
+JOB_SCHEDULE_JITTER = int(os.getenv('JOB_SCHEDULE_JITTER', '300'))  # 다음 실행 시각에 더하는 최대 지연(초)
+
+# 실패한 실행을 이 시간(시간) 안에 다시 시도하면 저장된 단계 결과(체크포인트)부터 재개
+CHECKPOINT_WINDOW_HOURS = float(os.getenv('CHECKPOINT_WINDOW_HOURS', '24'))
+
+# 스크래퍼 워커 프로세스 풀
+SCRAPER_WORKERS_ENABLED = os.getenv('SCRAPER_WORKERS_ENABLED', 'true').lower() == 'true'
+SCRAPER_WORKERS_MAX = int(os.getenv('SCRAPER_WORKERS_MAX', '0'))  # 0이면 메모리/CPU로 자동 결정
+SCRAPER_WORKER_MEMORY_MB = int(os.getenv('SCRAPER_WORKER_MEMORY_MB', '800'))  # 워커 수 계산에 쓰는 워커당 예상 메모리
+SCRAPER_WORKER_RSS_LIMIT_MB = int(os.getenv('SCRAPER_WORKER_RSS_LIMIT_MB', '1500'))  # 넘으면 워커를 종료하고 교체
+SCRAPER_TASK_TIMEOUT = float(os.getenv('SCRAPER_TASK_TIMEOUT', '600'))
+SCRAPER_RSS_CHECK_INTERVAL = float(os.getenv('SCRAPER_RSS_CHECK_INTERVAL', '1.0'))
@@ -0,0 +1,11 @@
+import hashlib
+from typing import Any, Dict
+
+# 바뀌었을 때만 movie 행을 다시 써야 하는 컬럼들
+CONTENT_HASH_FIELDS = ['title', 'release_date', 'overview', 'poster_path', 'is_theatrical_release']
+
+# movie.content_hash 컬럼에 저장하는 영화 내용 해시
+# 날짜는 문자열/date 어느 쪽으로 들어와도 같은 값이 나오도록 str()로 맞춘다
+def movie_content_hash(movie: Dict[str, Any]) -> str:
+    values = ['' if movie.get(field) is None else str(movie.get(field)) for field in CONTENT_HASH_FIELDS]
+    return hashlib.md5('\x1f'.join(values).encode('utf-8')).hexdigest()
@@ -1,42 +1,128 @@
 import asyncio
+import time
+import uuid
 import asyncpg
-from typing import List, Dict, Any, Tuple
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Tuple, Iterable, AsyncIterable, AsyncIterator, Optional, Union
 from logging_config import get_logger
-from config import DB_CONFIG
+from config import (
+    DB_CONFIG, BULK_MERGE_CHUNK_SIZE, DB_CONNECTION_PROFILE, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE,
+    DB_POOL_MAX_INACTIVE_LIFETIME, DB_STATEMENT_CACHE_SIZE
+)
 
 logger = get_logger(__name__)
 
-pool = None
+def pool_options(profile: str) -> Dict[str, Any]:
+    # PgBouncer 트랜잭션 모드에서는 연결마다 다른 서버 세션이 잡히므로 prepared statement 캐시를 끈다
+    if profile == 'pooler':
+        return {
+            'statement_cache_size': 0,
+            'max_cached_statement_lifetime': 0,
+            'server_settings': {
+                'statement_timeout': '60000',
+                'prepared_statements': 'false'
+            }
+        }
+    # Postgres에 직접 연결하면 세션이 유지되므로 statement 캐시로 반복 쿼리의 parse/plan 비용을 줄인다
+    if profile == 'direct':
+        return {
+            'statement_cache_size': DB_STATEMENT_CACHE_SIZE,
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'max_inactive_connection_lifetime': DB_POOL_MAX_INACTIVE_LIFETIME,
+            'server_settings': {
+                'statement_timeout': '60000'
+            }
+        }
+    raise ValueError(f"알 수 없는 DB 연결 프로필: {profile}")
 
-async def get_db_pool():
-    global pool
-    if not pool:
+async def create_db_pool(profile: str = DB_CONNECTION_PROFILE) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        host=DB_CONFIG['host'],
+        port=DB_CONFIG['port'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        database=DB_CONFIG['database'],
+        command_timeout=60,
+        **pool_options(profile)
+    )
+
+# 프로세스 전체에서 하나만 만드는 연결 풀
+# 스케줄러가 시작할 때 만들어 각 작업에 넘기고 종료할 때만 닫는다 (작업에서는 닫지 않는다)
+# acquire()는 asyncpg 풀과 같은 방식으로 쓰고, 연결을 기다린 시간과 풀 크기를 기록한다
+class DBPool:
+    def __init__(self, profile: str = DB_CONNECTION_PROFILE):
+        self.profile = profile
+        self.pool: Optional[asyncpg.Pool] = None
+        self.acquire_count = 0
+        self.acquire_wait_total = 0.0
+        self.acquire_wait_max = 0.0
+        self.in_use = 0
+        self.in_use_peak = 0
+
+    async def open(self) -> 'DBPool':
+        if self.pool is None:
+            self.pool = await create_db_pool(self.profile)
+            logger.info(f"데이터베이스 연결 풀 생성 완료 (프로필: {self.profile})")
+        return self
+
+    @asynccontextmanager
+    async def acquire(self):
+        start = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            wait = time.perf_counter() - start
+            self.acquire_count += 1
+            self.acquire_wait_total += wait
+            self.acquire_wait_max = max(self.acquire_wait_max, wait)
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+            try:
+                yield conn
+            finally:
+                self.in_use -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "size": self.pool.get_size() if self.pool else 0,
+            "idle": self.pool.get_idle_size() if self.pool else 0,
+            "min_size": self.pool.get_min_size() if self.pool else 0,
+            "max_size": self.pool.get_max_size() if self.pool else 0,
+            "in_use_peak": self.in_use_peak,
+            "acquires": self.acquire_count,
+            "acquire_wait_avg_ms": self.acquire_wait_total / self.acquire_count * 1000 if self.acquire_count else 0.0,
+            "acquire_wait_max_ms": self.acquire_wait_max * 1000
+        }
+
+    def log_metrics(self) -> None:
+        metrics = self.metrics()
+        logger.info(
+            f"DB 풀: 크기 {metrics['size']}/{metrics['max_size']} (유휴 {metrics['idle']}, 최대 사용 {metrics['in_use_peak']}), "
+            f"연결 획득 {metrics['acquires']}회, 대기 평균 {metrics['acquire_wait_avg_ms']:.1f}ms / 최대 {metrics['acquire_wait_max_ms']:.1f}ms"
+        )
+
+    async def close(self) -> None:
+        if self.pool:
+            self.log_metrics()
+            await self.pool.close()
+            self.pool = None
+
+db_pool: Optional[DBPool] = None
+
+async def get_db_pool() -> DBPool:
+    global db_pool
+    if not db_pool:
         try:
-            pool = await asyncpg.create_pool(
-                host=DB_CONFIG['host'],
-                port=DB_CONFIG['port'],
-                user=DB_CONFIG['user'],
-                password=DB_CONFIG['password'],
-                database=DB_CONFIG['database'],
-                statement_cache_size=0,
-                max_cached_statement_lifetime=0,
-                server_settings={
-                    'statement_timeout': '60000',
-                    'prepared_statements': 'false'
-                },
-                command_timeout=60
-            )
-            logger.info("데이터베이스 연결 풀 생성 완료")
+            db_pool = await DBPool().open()
         except Exception as e:
             logger.error(f"데이터베이스 연결 풀 생성 중 오류 발생: {str(e)}")
             raise
-    return pool
+    return db_pool
 
 async def close_db_pool():
-    global pool
-    if pool:
-        await pool.close()
-        pool = None
+    global db_pool
+    if db_pool:
+        await db_pool.close()
+        db_pool = None
 
 async def execute_query(pool, query: str, *args) -> List[Dict[str, Any]]:
     async with pool.acquire() as conn:
@@ -80,3 +166,91 @@ async def batch_insert(pool, table_name: str, columns: List[str], records: List[
 
 
 
+
+@asynccontextmanager
+async def acquire_connection(pool_or_conn):
+    if isinstance(pool_or_conn, (asyncpg.Pool, DBPool)):
+        async with pool_or_conn.acquire() as conn:
+            yield conn
+    else:
+        yield pool_or_conn
+
+async def iter_chunks(records: Union[Iterable[Tuple], AsyncIterable[Tuple]], size: int) -> AsyncIterator[List[Tuple]]:
+    chunk = []
+    if hasattr(records, '__aiter__'):
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+# COPY로 임시 테이블에 넣은 뒤 INSERT ... ON CONFLICT로 대상 테이블에 합치는 대량 업서트
+# 임시 테이블은 호출마다 고유한 이름으로 만들고 트랜잭션이 끝나면 삭제된다 (ON COMMIT DROP)
+# 입력은 chunk_size 단위로 나눠 처리하고, 청크 안에서 충돌 키가 중복되면 한 행만 남긴다
+# 반환하는 inserted/updated/unchanged는 청크별 행 수의 합이라 여러 청크에 같은 키가 있으면 중복으로 센다
+# update_columns가 없으면 DO NOTHING, update_where가 있으면 그 조건을 만족하는 행만 수정한다
+async def bulk_merge(pool_or_conn, table: str, columns: List[str],
+                     records: Union[Iterable[Tuple], AsyncIterable[Tuple]],
+                     conflict_keys: List[str], update_columns: Optional[List[str]] = None,
+                     returning: Optional[List[str]] = None, update_where: Optional[str] = None,
+                     chunk_size: int = BULK_MERGE_CHUNK_SIZE) -> Dict[str, Any]:
+    temp_table = f"tmp_{table}_{uuid.uuid4().hex[:12]}"
+    column_list = ', '.join(columns)
+    key_list = ', '.join(conflict_keys)
+    if update_columns:
+        conflict_action = 'DO UPDATE SET ' + ', '.join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+        if update_where:
+            conflict_action += f" WHERE {update_where}"
+    else:
+        conflict_action = 'DO NOTHING'
+    returning_list = ''.join(f", {column}" for column in returning or [])
+
+    merge_query = f'''
+        WITH staged AS (
+            SELECT DISTINCT ON ({key_list}) {column_list}
+            FROM {temp_table}
+            ORDER BY {key_list}
+        ), merged AS (
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM staged
+            ON CONFLICT ({key_list}) {conflict_action}
+            RETURNING (xmax = 0) AS inserted{returning_list}
+        )
+        SELECT (SELECT count(*) FROM staged) AS total, merged.*
+        FROM (SELECT 1) AS one
+        LEFT JOIN merged ON TRUE
+    '''
+    result = {"inserted": 0, "updated": 0, "unchanged": 0, "rows": []}
+
+    async with acquire_connection(pool_or_conn) as conn:
+        try:
+            async with conn.transaction():
+                await conn.execute(f'''
+                    CREATE TEMP TABLE {temp_table} ON COMMIT DROP AS
+                    SELECT {column_list} FROM {table} WITH NO DATA
+                ''')
+                async for chunk in iter_chunks(records, chunk_size):
+                    await conn.copy_records_to_table(temp_table, records=chunk, columns=columns)
+                    rows = await conn.fetch(merge_query)
+                    await conn.execute(f"TRUNCATE {temp_table}")
+
+                    merged_rows = [row for row in rows if row['inserted'] is not None]
+                    inserted = sum(1 for row in merged_rows if row['inserted'])
+                    result["inserted"] += inserted
+                    result["updated"] += len(merged_rows) - inserted
+                    result["unchanged"] += rows[0]['total'] - len(merged_rows)
+                    if returning:
+                        result["rows"] += [{column: row[column] for column in returning} for row in merged_rows]
+        except Exception as e:
+            logger.error(f"대량 병합 중 오류 발생: {e}")
+            logger.error(f"Table: {table}, Columns: {columns}")
+            raise
+    return result
@@ -1,42 +1,77 @@
 import asyncio
 import time
-from typing import List, Tuple
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
 from cgv_movie_info import get_cgv_released_movie, get_cgv_releasing_movie
 from lotte_movie_info import get_lotte_released_info, get_lotte_upcoming_info
 from logging_config import get_logger
+from title_normalizer import clean_titles
+from scraper_workers import run_scraper
+from config import CHAIN_CONCURRENCY
 
 logger = get_logger(__name__)
 
 def merge_movie_info(movie_info: List[str], movie_theater_info: List[str]) -> List[str]:
-    return list(set(movie_info + movie_theater_info))
+    return clean_titles(movie_info + movie_theater_info)
 
-async def get_cgv_movies() -> Tuple[List[str], List[str]]:
-    try:
-        logger.info("CGV 영화 정보 가져오기 시작")
+async def fetch_listing(chain_name: str, listing_name: str, fetch: Callable[[], Awaitable[List[str]]],
+                        semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    async with semaphore:
         start_time = time.time()
-        released = await get_cgv_released_movie()
-        releasing = await get_cgv_releasing_movie()
-        end_time = time.time()
-        logger.info(f"CGV 영화 정보 가져오기 완료 (소요 시간: {end_time - start_time:.2f}초)")
-        return released, releasing
-    except Exception as e:
-        logger.error(f"CGV 영화 정보 가져오기 실패: {e}")
-        return [], []
+        try:
+            titles = await fetch()
+            error = None
+        except Exception as e:
+            titles, error = [], e
+        elapsed = time.time() - start_time
 
-async def get_lotte_movies() -> Tuple[List[str], List[str]]:
-    try:
-        logger.info("롯데시네마 영화 정보 가져오기 시작")
-        start_time = time.time()
-        released = await get_lotte_released_info()
-        upcoming = await get_lotte_upcoming_info()
-        end_time = time.time()
-        logger.info(f"롯데시네마 영화 정보 가져오기 완료 (소요 시간: {end_time - start_time:.2f}초)")
-        return released, upcoming
-    except Exception as e:
-        logger.error(f"롯데시네마 영화 정보 가져오기 실패: {e}")
-        return [], []
+    if error:
+        logger.error(f"{chain_name} {listing_name} 가져오기 실패 (소요 시간: {elapsed:.2f}초): {error}")
+    else:
+        logger.info(f"{chain_name} {listing_name} 가져오기 완료: {len(titles)}개 (소요 시간: {elapsed:.2f}초)")
+    return {"listing": listing_name, "titles": titles, "elapsed": elapsed, "error": error}
+
+async def fetch_chain_listings(chain_name: str,
+                               listings: Dict[str, Callable[[], Awaitable[List[str]]]]) -> Dict[str, Dict[str, Any]]:
+    logger.info(f"{chain_name} 영화 정보 가져오기 시작")
+    start_time = time.time()
+    # 영화관마다 동시에 띄울 수 있는 목록 조회 수를 제한
+    semaphore = asyncio.Semaphore(CHAIN_CONCURRENCY)
+    results = await asyncio.gather(*[
+        fetch_listing(chain_name, listing_name, fetch, semaphore)
+        for listing_name, fetch in listings.items()
+    ])
+
+    failed = [result["listing"] for result in results if result["error"]]
+    end_time = time.time()
+    if failed and len(failed) < len(results):
+        logger.warning(f"{chain_name} 영화 정보 일부만 가져옴 (실패한 목록: {', '.join(failed)}, 소요 시간: {end_time - start_time:.2f}초)")
+    elif failed:
+        logger.error(f"{chain_name} 영화 정보 가져오기 실패 (소요 시간: {end_time - start_time:.2f}초)")
+    else:
+        logger.info(f"{chain_name} 영화 정보 가져오기 완료 (소요 시간: {end_time - start_time:.2f}초)")
+    return {result["listing"]: result for result in results}
+
+# (상영작, 개봉 예정작, 모든 목록을 가져왔는지) 를 돌려준다
+def chain_titles(results: Dict[str, Dict[str, Any]]) -> Tuple[List[str], List[str], bool]:
+    complete = not any(result["error"] for result in results.values())
+    return results["상영작"]["titles"], results["개봉 예정작"]["titles"], complete
+
+async def get_cgv_movies() -> Tuple[List[str], List[str], bool]:
+    return chain_titles(await fetch_chain_listings("CGV", {
+        "상영작": partial(run_scraper, get_cgv_released_movie),
+        "개봉 예정작": partial(run_scraper, get_cgv_releasing_movie),
+    }))
+
+async def get_lotte_movies() -> Tuple[List[str], List[str], bool]:
+    return chain_titles(await fetch_chain_listings("롯데시네마", {
+        "상영작": partial(run_scraper, get_lotte_released_info),
+        "개봉 예정작": partial(run_scraper, get_lotte_upcoming_info),
+    }))
 
-async def get_all_movie_info() -> Tuple[List[str], List[str]]:
+# 영화관별 제목과 함께, 목록 중 하나라도 가져오지 못한 영화관 이름을 돌려준다
+# 일부만 가져온 제목은 상영 정보 추가에는 쓸 수 있지만 상영 종료 판정에 쓰면 상영 중인 영화가 지워진다
+async def get_all_movie_info() -> Tuple[List[str], List[str], List[str]]:
     logger.info("모든 영화관 정보 가져오기 시작")
     start_time = time.time()
     
@@ -47,18 +82,25 @@ async def get_all_movie_info() -> Tuple[List[str], List[str]]:
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
     cgv_movie_names, lotte_movie_names = [], []
+    incomplete_theaters = []
     
-    for i, result in enumerate(results):
+    for i, (theater_name, result) in enumerate(zip(['CGV', '롯데시네마'], results)):
         if isinstance(result, Exception):
             logger.error(f"영화관 정보 가져오기 실패 (인덱스: {i}): {result}")
-        else:
-            if i == 0:
-                cgv_movie_names = merge_movie_info(result[0], result[1])
-            elif i == 1:
-                lotte_movie_names = merge_movie_info(result[0], result[1])
+            incomplete_theaters.append(theater_name)
+            continue
+        released, upcoming, complete = result
+        if not complete:
+            incomplete_theaters.append(theater_name)
+        if i == 0:
+            cgv_movie_names = merge_movie_info(released, upcoming)
+        elif i == 1:
+            lotte_movie_names = merge_movie_info(released, upcoming)
     
     end_time = time.time()
     logger.info(f"모든 영화관 정보 가져오기 완료 (총 소요 시간: {end_time - start_time:.2f}초)")
     logger.info(f"CGV 영화 수: {len(cgv_movie_names)}, 롯데시네마 영화 수: {len(lotte_movie_names)}")
+    if incomplete_theaters:
+        logger.warning(f"목록을 모두 가져오지 못한 영화관: {', '.join(incomplete_theaters)}")
     
-    return cgv_movie_names, lotte_movie_names
\ No newline at end of file
+    return cgv_movie_names, lotte_movie_names, incomplete_theaters
@@ -0,0 +1,120 @@
+import asyncio
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from logging_config import get_logger
+from config import HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES
+
+logger = get_logger(__name__)
+
+class CachedResponse(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+
+def normalize_url(url: str) -> str:
+    parsed_url = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parsed_url.query, keep_blank_values=True)))
+    return urlunparse(parsed_url._replace(
+        scheme=parsed_url.scheme.lower(),
+        netloc=parsed_url.netloc.lower(),
+        query=query,
+        fragment=''
+    ))
+
+# ETag/Last-Modified와 압축한 응답 본문을 SQLite에 저장하는 HTTP 응답 캐시
+# 다음 실행에서 조건부 요청을 보내 304 응답이면 저장된 본문을 그대로 쓴다
+# 전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 지운다
+class HttpCache:
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS http_responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS http_responses_last_access_idx ON http_responses (last_access)')
+        self._conn.commit()
+
+    def _get(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, body FROM http_responses WHERE url = ?', (url,)
+            ).fetchone()
+        if not row:
+            return None
+        return CachedResponse(row[0], row[1], zlib.decompress(row[2]))
+
+    def _touch(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute('UPDATE http_responses SET last_access = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+
+    def _put(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        compressed = zlib.compress(body)
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO http_responses (url, etag, last_modified, body, size, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    body = excluded.body,
+                    size = excluded.size,
+                    last_access = excluded.last_access
+            ''', (url, etag, last_modified, compressed, len(compressed), time.time()))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        total_size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_responses').fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        for url, size in self._conn.execute('SELECT url, size FROM http_responses ORDER BY last_access').fetchall():
+            self._conn.execute('DELETE FROM http_responses WHERE url = ?', (url,))
+            self.evictions += 1
+            total_size -= size
+            if total_size <= self.max_bytes:
+                break
+
+    async def get(self, url: str) -> Optional[CachedResponse]:
+        return await asyncio.to_thread(self._get, normalize_url(url))
+
+    async def put(self, url: str, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        if not etag and not last_modified:
+            return
+        await asyncio.to_thread(self._put, normalize_url(url), etag, last_modified, body)
+
+    async def record_hit(self, url: str) -> None:
+        self.hits += 1
+        await asyncio.to_thread(self._touch, normalize_url(url))
+
+    def record_miss(self) -> None:
+        self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,169 @@
+import asyncio
+import codecs
+import json
+import re
+import time
+from html.parser import HTMLParser
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import aiohttp
+from logging_config import get_logger
+from config import HTTP_SCRAPER_ENABLED, HTTP_SCRAPER_TIMEOUT, HTTP_SCRAPER_MAX_PAGES
+
+logger = get_logger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+REQUEST_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+
+# (결합자, 태그, 클래스 목록) 형태로 CSS 선택자를 분해
+# 'tag.class', 'a b'(자손), 'a > b'(자식) 형태만 지원한다
+SelectorPart = Tuple[str, Optional[str], Tuple[str, ...]]
+
+def parse_selector(selector: str) -> List[SelectorPart]:
+    parts: List[SelectorPart] = []
+    combinator = ' '
+    for token in re.sub(r'\s*>\s*', ' > ', selector.strip()).split():
+        if token == '>':
+            combinator = '>'
+            continue
+        tag, *classes = token.split('.')
+        parts.append((combinator, tag or None, tuple(classes)))
+        combinator = ' '
+    return parts
+
+class TitleParser(HTMLParser):
+    def __init__(self, selector: str):
+        super().__init__(convert_charrefs=True)
+        self.parts = parse_selector(selector)
+        self.stack: List[Tuple[str, Tuple[str, ...]]] = []
+        self.capture_depth: Optional[int] = None
+        self.buffer: List[str] = []
+        self.titles: List[str] = []
+
+    def _matches_part(self, element: Tuple[str, Tuple[str, ...]], part: SelectorPart) -> bool:
+        tag, classes = element
+        _, part_tag, part_classes = part
+        return (part_tag is None or part_tag == tag) and all(c in classes for c in part_classes)
+
+    def _matches(self, part_index: int, stack_index: int) -> bool:
+        if not self._matches_part(self.stack[stack_index], self.parts[part_index]):
+            return False
+        if part_index == 0:
+            return True
+        if self.parts[part_index][0] == '>':
+            return stack_index > 0 and self._matches(part_index - 1, stack_index - 1)
+        return any(self._matches(part_index - 1, i) for i in range(stack_index - 1, -1, -1))
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in VOID_ELEMENTS:
+            return
+        classes = tuple((dict(attrs).get('class') or '').split())
+        self.stack.append((tag, classes))
+        if self.capture_depth is None and self._matches(len(self.parts) - 1, len(self.stack) - 1):
+            self.capture_depth = len(self.stack)
+            self.buffer = []
+
+    def handle_endtag(self, tag: str) -> None:
+        # 닫히지 않은 태그가 섞여 있어도 가장 가까운 같은 이름의 태그까지 정리한다
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                break
+        else:
+            return
+        if self.capture_depth is not None and len(self.stack) < self.capture_depth:
+            title = ' '.join(''.join(self.buffer).split())
+            if title:
+                self.titles.append(title)
+            self.capture_depth = None
+
+    def handle_data(self, data: str) -> None:
+        if self.capture_depth is not None:
+            self.buffer.append(data)
+
+async def fetch_html_titles(url: str, selector: str) -> List[str]:
+    timeout = aiohttp.ClientTimeout(total=HTTP_SCRAPER_TIMEOUT)
+    parser = TitleParser(selector)
+    async with aiohttp.ClientSession(headers=REQUEST_HEADERS, timeout=timeout) as session:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                parser.feed(decoder.decode(chunk))
+            parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    return parser.titles
+
+def extract_json_items(data: Any, items_path: Sequence[str]) -> List[Any]:
+    items = data
+    for key in items_path:
+        items = items.get(key, {}) if isinstance(items, dict) else {}
+    return items if isinstance(items, list) else []
+
+def extract_json_titles(data: Any, items_path: Sequence[str], title_key: str) -> List[str]:
+    return [
+        ' '.join(str(item[title_key]).split())
+        for item in extract_json_items(data, items_path)
+        if isinstance(item, dict) and item.get(title_key)
+    ]
+
+async def request_json(session: aiohttp.ClientSession, url: str,
+                       json_body: Optional[Dict[str, Any]] = None,
+                       form_data: Optional[Dict[str, str]] = None) -> Any:
+    if json_body is None and form_data is None:
+        request = session.get(url)
+    else:
+        request = session.post(url, json=json_body, data=form_data)
+    async with request as response:
+        response.raise_for_status()
+        # 일부 사이트는 JSON 응답에 text/html Content-Type을 붙여 보낸다
+        return json.loads(await response.text())
+
+async def fetch_json_titles(url: str, items_path: Sequence[str], title_key: str,
+                            json_body: Optional[Dict[str, Any]] = None,
+                            form_data: Optional[Dict[str, str]] = None) -> List[str]:
+    timeout = aiohttp.ClientTimeout(total=HTTP_SCRAPER_TIMEOUT)
+    async with aiohttp.ClientSession(headers=REQUEST_HEADERS, timeout=timeout) as session:
+        data = await request_json(session, url, json_body, form_data)
+    return extract_json_titles(data, items_path, title_key)
+
+# 페이지 단위로 나눠 주는 JSON API를 page_size보다 적게 오는 페이지까지 모두 받는다
+# page_request(page)는 request_json에 넘길 json_body/form_data를 돌려준다
+# max_pages 안에 끝나지 않으면 일부만 받은 목록을 쓰지 않도록 ValueError를 던진다
+async def fetch_paged_json_titles(url: str, items_path: Sequence[str], title_key: str, page_size: int,
+                                  page_request: Callable[[int], Dict[str, Any]],
+                                  max_pages: int = HTTP_SCRAPER_MAX_PAGES) -> List[str]:
+    timeout = aiohttp.ClientTimeout(total=HTTP_SCRAPER_TIMEOUT)
+    titles: List[str] = []
+    async with aiohttp.ClientSession(headers=REQUEST_HEADERS, timeout=timeout) as session:
+        for page in range(1, max_pages + 1):
+            data = await request_json(session, url, **page_request(page))
+            titles += extract_json_titles(data, items_path, title_key)
+            if len(extract_json_items(data, items_path)) < page_size:
+                return titles
+    raise ValueError(f"{max_pages}페이지 안에 목록이 끝나지 않았습니다: {url}")
+
+# fast_path가 None이면 HTTP로는 전체 목록을 받을 수 없는 페이지이므로 바로 셀레니움으로 가져온다
+async def fetch_with_fallback(name: str,
+                              fast_path: Optional[Callable[[], Awaitable[List[str]]]],
+                              fallback: Callable[[], Awaitable[List[str]]]) -> List[str]:
+    if HTTP_SCRAPER_ENABLED and fast_path is not None:
+        start_time = time.time()
+        try:
+            titles = await fast_path()
+            if titles:
+                logger.info(f"{name} HTTP 스크래핑 완료: {len(titles)}개 (소요 시간: {time.time() - start_time:.2f}초)")
+                return titles
+            logger.info(f"{name} HTTP 스크래핑 결과 없음. 셀레니움으로 재시도합니다.")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning(f"{name} HTTP 스크래핑 실패. 셀레니움으로 재시도합니다: {e}")
+    return await fallback()
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+class JobResult(NamedTuple):
+    name: str
+    status: str  # success / failed / skipped
+    result: Any
+    error: Optional[BaseException]
+    ready_at: float
+    started_at: float
+    finished_at: float
+
+# DAG 노드: func는 depends_on 순서대로 선행 작업의 결과를 인자로 받는다
+# kind는 동시 실행 제한을 공유하는 자원 종류 (browser, http, db 등)
+class Job:
+    def __init__(self, name: str, func: Callable[..., Awaitable[Any]], kind: str, depends_on: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.kind = kind
+        self.depends_on = list(depends_on)
+
+# 선언된 의존 관계대로 작업을 실행하는 작은 DAG 실행기
+# 선행 작업이 끝나는 즉시 다음 작업을 시작하고, 관계없는 작업은 서로 기다리지 않는다
+# 선행 작업이 실패하면 그 뒤의 작업은 건너뛴다
+class JobDAG:
+    def __init__(self, concurrency: Dict[str, int]):
+        self.semaphores = {kind: asyncio.Semaphore(limit) for kind, limit in concurrency.items()}
+        self.jobs: Dict[str, Job] = {}
+
+    def add(self, name: str, func: Callable[..., Awaitable[Any]], kind: str, depends_on: Sequence[str] = ()) -> None:
+        if name in self.jobs:
+            raise ValueError(f"이미 등록된 작업: {name}")
+        if kind not in self.semaphores:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        self.jobs[name] = Job(name, func, kind, depends_on)
+
+    def validate(self) -> None:
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"순환 의존 관계: {name}")
+            visiting.add(name)
+            for dependency in self.jobs[name].depends_on:
+                if dependency not in self.jobs:
+                    raise ValueError(f"{name}의 선행 작업이 없습니다: {dependency}")
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.jobs:
+            visit(name)
+
+    async def run(self) -> Dict[str, JobResult]:
+        self.validate()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_job(job: Job) -> JobResult:
+            dependencies = [await tasks[dependency] for dependency in job.depends_on]
+            ready_at = time.monotonic()
+            failed = [dependency.name for dependency in dependencies if dependency.status != 'success']
+            if failed:
+                logger.warning(f"작업 {job.name} 건너뜀 (실패한 선행 작업: {', '.join(failed)})")
+                return JobResult(job.name, 'skipped', None, None, ready_at, ready_at, ready_at)
+
+            async with self.semaphores[job.kind]:
+                started_at = time.monotonic()
+                try:
+                    result = await job.func(*[dependency.result for dependency in dependencies])
+                except Exception as e:
+                    logger.exception(f"작업 {job.name} 실행 중 오류 발생: {e}")
+                    return JobResult(job.name, 'failed', None, e, ready_at, started_at, time.monotonic())
+            return JobResult(job.name, 'success', result, None, ready_at, started_at, time.monotonic())
+
+        for job in self.jobs.values():
+            tasks[job.name] = asyncio.create_task(run_job(job), name=job.name)
+        results = await asyncio.gather(*tasks.values())
+        return {result.name: result for result in results}
+
+    def critical_path(self, results: Dict[str, JobResult]) -> List[str]:
+        # 가장 늦게 끝난 작업에서 시작해 가장 늦게 끝난 선행 작업을 따라 거슬러 올라간다
+        if not results:
+            return []
+        path = [max(results.values(), key=lambda result: result.finished_at).name]
+        while self.jobs[path[-1]].depends_on:
+            path.append(max(self.jobs[path[-1]].depends_on, key=lambda name: results[name].finished_at))
+        return list(reversed(path))
+
+    def report(self, results: Dict[str, JobResult], started_at: float) -> None:
+        for result in sorted(results.values(), key=lambda result: result.started_at):
+            logger.info(
+                f"[{result.status}] {result.name} ({self.jobs[result.name].kind}): "
+                f"시작 +{result.started_at - started_at:.2f}초, 대기 {result.started_at - result.ready_at:.2f}초, "
+                f"실행 {result.finished_at - result.started_at:.2f}초"
+            )
+        path = self.critical_path(results)
+        if path:
+            total = results[path[-1]].finished_at - started_at
+            logger.info(f"임계 경로: {' -> '.join(path)} (총 {total:.2f}초)")
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from logging_config import get_logger
+from job_dag import JobResult
+from config import JOB_INTERVAL_HOURS, JOB_RETRY_DELAY
+
+logger = get_logger(__name__)
+
+# 앞 작업의 결과(체크포인트)를 받아 이어서 실행하는 뒤 작업들
+# 뒤 작업이 실패하면 앞 작업을 JOB_RETRY_DELAY 뒤에 다시 실행해서 체크포인트로 재개한다
+RESUMABLE_TAIL_JOBS = {'scrape': ['theaters_info', 'ended']}
+
+async def load_job_state(conn) -> Dict[str, Dict[str, Any]]:
+    rows = await conn.fetch("SELECT job_name, last_success_at, last_attempt_at, last_status FROM job_state")
+    return {row['job_name']: dict(row) for row in rows}
+
+async def save_job_results(conn, results: Dict[str, JobResult], finished_at: datetime) -> None:
+    names = list(results.keys())
+    statuses = [results[name].status for name in names]
+    await conn.execute('''
+        INSERT INTO job_state (job_name, last_success_at, last_attempt_at, last_status)
+        SELECT job_name, CASE WHEN status = 'success' THEN $3 END, $3, status
+        FROM unnest($1::text[], $2::text[]) AS j(job_name, status)
+        ON CONFLICT (job_name) DO UPDATE
+        SET last_success_at = COALESCE(EXCLUDED.last_success_at, job_state.last_success_at),
+            last_attempt_at = EXCLUDED.last_attempt_at,
+            last_status = EXCLUDED.last_status
+    ''', names, statuses, finished_at)
+
+# 작업을 다시 실행할 시각
+# 성공했으면 마지막 성공 + 주기, 실패했으면 마지막 시도 + JOB_RETRY_DELAY (둘 중 늦은 쪽)
+# 뒤 작업이 실패했으면 그 시도 + JOB_RETRY_DELAY에 앞당겨 실행한다
+def next_due_at(job_name: str, state: Dict[str, Dict[str, Any]], now: datetime) -> datetime:
+    job_state = state.get(job_name)
+    if not job_state or not job_state['last_attempt_at']:
+        return now
+    retry_delay = timedelta(seconds=JOB_RETRY_DELAY)
+    interval = timedelta(hours=JOB_INTERVAL_HOURS[job_name])
+    due_at = job_state['last_success_at'] + interval if job_state['last_success_at'] else now
+    if job_state['last_status'] != 'success':
+        due_at = max(due_at, job_state['last_attempt_at'] + retry_delay)
+    for tail_name in RESUMABLE_TAIL_JOBS.get(job_name, []):
+        tail_state = state.get(tail_name)
+        if tail_state and tail_state['last_attempt_at'] and tail_state['last_status'] != 'success':
+            due_at = min(due_at, tail_state['last_attempt_at'] + retry_delay)
+    return due_at
+
+def due_jobs(state: Dict[str, Dict[str, Any]], now: datetime) -> List[str]:
+    due = []
+    for job_name in JOB_INTERVAL_HOURS:
+        due_at = next_due_at(job_name, state, now)
+        if due_at <= now:
+            due.append(job_name)
+        else:
+            logger.info(f"작업 {job_name} 건너뜀 (다음 실행: {due_at.isoformat(timespec='seconds')})")
+    return due
+
+def seconds_until_next_job(state: Dict[str, Dict[str, Any]], now: datetime) -> float:
+    next_at = min(next_due_at(job_name, state, now) for job_name in JOB_INTERVAL_HOURS)
+    return max((next_at - now).total_seconds(), 0.0)
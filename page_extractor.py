@@ -0,0 +1,59 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Sequence
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 선택자에 맞는 요소들의 텍스트와 속성을 한 번의 스크립트 호출로 가져온다
+# 속성이 요소에 없으면 그 속성을 가진 가장 가까운 조상(예: 상세 페이지 링크)에서 찾는다
+EXTRACT_SCRIPT = """
+const [selector, attributes, start] = arguments;
+return Array.from(document.querySelectorAll(selector)).slice(start).map(e => {
+    const item = {text: e.innerText || ''};
+    for (const attribute of attributes) {
+        const owner = e.hasAttribute(attribute) ? e : e.closest('[' + attribute + ']');
+        item[attribute] = owner ? owner.getAttribute(attribute) : null;
+    }
+    return item;
+});
+"""
+
+def normalize_text(text: Optional[str]) -> str:
+    return ' '.join((text or '').split())
+
+def dedupe_elements(elements: Iterable[Dict[str, Optional[str]]], key: str = 'text') -> List[Dict[str, Optional[str]]]:
+    seen = set()
+    unique = []
+    for element in elements:
+        value = element.get(key)
+        if not value or value in seen:
+            continue
+        seen.add(value)
+        unique.append(element)
+    return unique
+
+async def extract_elements(driver, css_selector: str, attributes: Sequence[str] = (),
+                           start: int = 0) -> List[Dict[str, Optional[str]]]:
+    elements = await asyncio.to_thread(driver.execute_script, EXTRACT_SCRIPT, css_selector, list(attributes), start)
+    for element in elements:
+        element['text'] = normalize_text(element['text'])
+    return elements
+
+async def extract_texts(driver, css_selector: str, start: int = 0) -> List[str]:
+    elements = await extract_elements(driver, css_selector, start=start)
+    return [element['text'] for element in dedupe_elements(elements)]
+
+# 표의 각 행을 셀 텍스트와 행 안의 링크 목록으로 한 번에 가져온다
+TABLE_ROWS_SCRIPT = """
+const [rowSelector, start] = arguments;
+return Array.from(document.querySelectorAll(rowSelector)).slice(start).map(row => ({
+    cells: Array.from(row.querySelectorAll('td')).map(td => td.innerText || ''),
+    links: Array.from(row.querySelectorAll('a[href]')).map(a => a.getAttribute('href'))
+}));
+"""
+
+async def extract_table_rows(driver, row_selector: str, start: int = 0) -> List[Dict[str, List[str]]]:
+    rows = await asyncio.to_thread(driver.execute_script, TABLE_ROWS_SCRIPT, row_selector, start)
+    for row in rows:
+        row['cells'] = [normalize_text(cell) for cell in row['cells']]
+    return rows
@@ -0,0 +1,134 @@
+import asyncio
+from typing import Dict, List, Optional
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from logging_config import get_logger
+from page_extractor import extract_elements, extract_table_rows, dedupe_elements
+from page_waits import count_elements, install_network_hook, is_more_button_visible, wait_for_more_items
+from config import PAGINATION_SETTLE_TIMEOUT, PAGINATION_MAX_CLICKS
+
+logger = get_logger(__name__)
+
+SCROLL_SCRIPT = "window.scrollTo(0, document.body.scrollHeight);"
+# 버튼이 계속 다시 그려지는 페이지에서 무한히 재시도하지 않도록 연속 StaleElementReferenceException 허용 횟수
+MAX_STALE_RETRIES = 3
+
+# 동작(클릭/스크롤) 후 항목 수가 늘면 바로 새 개수를 돌려준다
+# more_selector가 있으면 더보기 버튼이 사라진 것을 마지막 페이지 신호로 보고 전체 대기 시간을 쓰지 않는다
+async def load_next(driver, item_selector: str, count: int, action, more_selector: Optional[str] = None) -> int:
+    await action()
+    return await wait_for_more_items(driver, item_selector, count, more_selector, timeout=PAGINATION_SETTLE_TIMEOUT)
+
+# "더보기" 버튼을 누르며 새로 추가된 항목만 가져온다
+# 버튼이 사라지거나 클릭 후 항목 수가 늘지 않으면 마지막 페이지로 판단한다
+async def paginate_load_more(driver, item_selector: str, more_selector: str, scroll: bool = False,
+                             max_clicks: int = PAGINATION_MAX_CLICKS) -> List[str]:
+    elements = await extract_elements(driver, item_selector)
+    count = len(elements)
+    clicks = 0
+    stale_retries = 0
+    await install_network_hook(driver)
+
+    while clicks < max_clicks:
+        # 첫 클릭 이후에 버튼이 보이지 않으면 마지막 페이지까지 다 받은 것이다
+        if clicks and not await is_more_button_visible(driver, more_selector):
+            break
+        try:
+            if scroll:
+                await asyncio.to_thread(driver.execute_script, SCROLL_SCRIPT)
+            more_button = await asyncio.to_thread(
+                WebDriverWait(driver, PAGINATION_SETTLE_TIMEOUT).until,
+                EC.element_to_be_clickable((By.CSS_SELECTOR, more_selector))
+            )
+            new_count = await load_next(
+                driver, item_selector, count, lambda: asyncio.to_thread(more_button.click), more_selector
+            )
+            clicks += 1
+            stale_retries = 0
+        except TimeoutException:
+            break
+        except StaleElementReferenceException:
+            stale_retries += 1
+            if stale_retries > MAX_STALE_RETRIES:
+                logger.warning(f"StaleElementReferenceException이 {MAX_STALE_RETRIES}회 넘게 반복되어 중단합니다.")
+                break
+            logger.warning("StaleElementReferenceException 발생. 다시 시도합니다.")
+            continue
+
+        if new_count <= count:
+            break
+        # 새로 추가된 항목만 가져온다
+        new_elements = await extract_elements(driver, item_selector, start=count)
+        elements += new_elements
+        count += len(new_elements)
+
+    # 클릭으로 목록이 통째로 다시 그려졌다면 누적 결과 대신 현재 목록을 다시 읽는다
+    if await count_elements(driver, item_selector) != count:
+        elements = await extract_elements(driver, item_selector)
+        count = len(elements)
+
+    logger.info(f"더보기 {clicks}회 클릭, 총 {count}개 항목 수집")
+    return [element['text'] for element in dedupe_elements(elements)]
+
+FIRST_ROW_SCRIPT = """
+const row = document.querySelector(arguments[0]);
+return row ? row.innerText : null;
+"""
+
+async def wait_for_first_row_change(driver, row_selector: str, previous_first_row: Optional[str],
+                                    timeout: float = PAGINATION_SETTLE_TIMEOUT) -> bool:
+    try:
+        await asyncio.to_thread(
+            WebDriverWait(driver, timeout, poll_frequency=0.2).until,
+            lambda d: d.execute_script(FIRST_ROW_SCRIPT, row_selector) not in (None, previous_first_row)
+        )
+        return True
+    except TimeoutException:
+        return False
+
+# 표 전체를 페이지 단위로 모은다
+# 다음 페이지 버튼이 있으면 눌러서 표가 바뀔 때까지 기다리고, 없으면 스크롤해서 행이 추가되기를 기다린다
+async def paginate_table(driver, row_selector: str, next_selector: Optional[str] = None,
+                         max_pages: int = PAGINATION_MAX_CLICKS) -> List[Dict[str, List[str]]]:
+    rows = await extract_table_rows(driver, row_selector)
+    collected = list(rows)
+    count = len(rows)
+    pages = 1
+    stale_retries = 0
+    await install_network_hook(driver)
+
+    while pages < max_pages:
+        next_buttons = []
+        if next_selector:
+            next_buttons = await asyncio.to_thread(driver.find_elements, By.CSS_SELECTOR, next_selector)
+        if next_buttons:
+            previous_first_row = await asyncio.to_thread(driver.execute_script, FIRST_ROW_SCRIPT, row_selector)
+            try:
+                await asyncio.to_thread(next_buttons[0].click)
+            except StaleElementReferenceException:
+                stale_retries += 1
+                if stale_retries > MAX_STALE_RETRIES:
+                    logger.warning(f"StaleElementReferenceException이 {MAX_STALE_RETRIES}회 넘게 반복되어 중단합니다.")
+                    break
+                logger.warning("StaleElementReferenceException 발생. 다시 시도합니다.")
+                continue
+            stale_retries = 0
+            if not await wait_for_first_row_change(driver, row_selector, previous_first_row):
+                break
+            rows = await extract_table_rows(driver, row_selector)
+            collected += rows
+        else:
+            new_count = await load_next(
+                driver, row_selector, count, lambda: asyncio.to_thread(driver.execute_script, SCROLL_SCRIPT)
+            )
+            if new_count <= count:
+                break
+            rows = await extract_table_rows(driver, row_selector, start=count)
+            collected += rows
+            count += len(rows)
+        pages += 1
+
+    logger.info(f"표 {pages}페이지, 총 {len(collected)}개 행 수집")
+    return collected
@@ -0,0 +1,165 @@
+import asyncio
+from typing import Any, Optional
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from logging_config import get_logger
+from config import TIMEOUT, PAGE_SETTLE_QUIET_MS, PAGE_SETTLE_TIMEOUT
+
+logger = get_logger(__name__)
+
+COUNT_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+
+# 항목들을 모두 담고 있는 가장 가까운 조상 요소
+# 배너/광고처럼 목록 밖에서 계속 바뀌는 DOM은 관찰하지 않기 위해 body 대신 이 요소만 관찰한다
+FIND_LIST_CONTAINER = """
+function findListContainer(selector) {
+    const items = document.querySelectorAll(selector);
+    if (!items.length || !items[0].parentElement) return document.body;
+    let container = items[0].parentElement;
+    while (container.parentElement && container.querySelectorAll(selector).length < items.length) {
+        container = container.parentElement;
+    }
+    return container;
+}
+"""
+
+# fetch/XHR 진행 중 요청 수를 세는 훅 (한 번만 설치)
+INSTALL_NETWORK_HOOK = """
+if (window.__pageWaitPending === undefined) {
+    window.__pageWaitPending = 0;
+    const originalFetch = window.fetch;
+    if (originalFetch) {
+        window.fetch = function () {
+            window.__pageWaitPending += 1;
+            return originalFetch.apply(this, arguments).finally(() => { window.__pageWaitPending -= 1; });
+        };
+    }
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__pageWaitPending += 1;
+        this.addEventListener('loadend', () => { window.__pageWaitPending -= 1; }, {once: true});
+        return originalSend.apply(this, arguments);
+    };
+}
+"""
+
+# 진행 중 요청이 없고 새 리소스 로딩도 quietMs 동안 없으면 true를 돌려준다
+NETWORK_IDLE_SCRIPT = INSTALL_NETWORK_HOOK + """
+const [quietMs, timeoutMs, done] = arguments;
+const start = Date.now();
+let lastCount = performance.getEntriesByType('resource').length;
+let lastActivity = start;
+const timer = setInterval(() => {
+    const now = Date.now();
+    const count = performance.getEntriesByType('resource').length;
+    if (count !== lastCount || window.__pageWaitPending > 0 || document.readyState === 'loading') {
+        lastCount = count;
+        lastActivity = now;
+    }
+    if (now - lastActivity >= quietMs) {
+        clearInterval(timer);
+        done(true);
+    } else if (now - start >= timeoutMs) {
+        clearInterval(timer);
+        done(false);
+    }
+}, 50);
+"""
+
+# 목록 컨테이너에 quietMs 동안 DOM 변경이 없으면 true, timeoutMs가 지나면 false를 돌려준다
+LIST_QUIET_SCRIPT = FIND_LIST_CONTAINER + """
+const [itemSelector, quietMs, timeoutMs, done] = arguments;
+const start = Date.now();
+let lastMutation = start;
+const observer = new MutationObserver(() => { lastMutation = Date.now(); });
+observer.observe(findListContainer(itemSelector), {childList: true, subtree: true, characterData: true});
+const timer = setInterval(() => {
+    const now = Date.now();
+    if (now - lastMutation >= quietMs || now - start >= timeoutMs) {
+        clearInterval(timer);
+        observer.disconnect();
+        done(now - lastMutation >= quietMs);
+    }
+}, 50);
+"""
+
+# 클릭/스크롤 후 호출: 항목 수가 previousCount보다 늘면 바로 새 개수를 돌려준다
+# moreSelector가 있으면 더보기 버튼이 사라지고 요청과 목록 변경이 quietMs 동안 없을 때 마지막 페이지로 보고 바로 돌려준다
+# 그 밖에는 timeoutMs까지 기다린다 (느린 응답도 놓치지 않도록 "변경 없음"만으로는 끝내지 않는다)
+MORE_ITEMS_SCRIPT = FIND_LIST_CONTAINER + """
+const [itemSelector, moreSelector, previousCount, quietMs, timeoutMs, done] = arguments;
+const start = Date.now();
+let lastActivity = start;
+let finished = false;
+const moreButtonVisible = () => Array.from(document.querySelectorAll(moreSelector)).some((button) => button.offsetParent !== null);
+const finish = (count) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(timer);
+    done(count);
+};
+const check = () => {
+    const now = Date.now();
+    const count = document.querySelectorAll(itemSelector).length;
+    if (count > previousCount) return finish(count);
+    if ((window.__pageWaitPending || 0) > 0) lastActivity = now;
+    if (moreSelector && !moreButtonVisible() && now - lastActivity >= quietMs) return finish(count);
+    if (now - start >= timeoutMs) finish(count);
+};
+const observer = new MutationObserver(() => { lastActivity = Date.now(); check(); });
+observer.observe(findListContainer(itemSelector), {childList: true, subtree: true});
+// 목록 전체가 새 요소로 바뀌면 관찰 중인 컨테이너가 떨어져 나가므로 주기적으로도 확인한다
+const timer = setInterval(check, 50);
+"""
+
+MORE_BUTTON_VISIBLE_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).some((button) => button.offsetParent !== null);
+"""
+
+def run_async_script(driver, script: str, timeout: float, *args) -> Any:
+    driver.set_script_timeout(timeout + 1)
+    return driver.execute_async_script(script, *args)
+
+async def count_elements(driver, css_selector: str) -> int:
+    return await asyncio.to_thread(driver.execute_script, COUNT_SCRIPT, css_selector)
+
+async def wait_for_elements(driver, css_selector: str, timeout: float = TIMEOUT) -> None:
+    await asyncio.to_thread(
+        WebDriverWait(driver, timeout).until,
+        EC.presence_of_all_elements_located((By.CSS_SELECTOR, css_selector))
+    )
+
+# 페이지네이션 요청이 진행 중인지 알 수 있도록 클릭 전에 설치한다
+async def install_network_hook(driver) -> None:
+    await asyncio.to_thread(driver.execute_script, INSTALL_NETWORK_HOOK)
+
+async def is_more_button_visible(driver, more_selector: str) -> bool:
+    return await asyncio.to_thread(driver.execute_script, MORE_BUTTON_VISIBLE_SCRIPT, more_selector)
+
+async def wait_for_more_items(driver, item_selector: str, previous_count: int, more_selector: Optional[str] = None,
+                              quiet_ms: int = PAGE_SETTLE_QUIET_MS, timeout: float = PAGE_SETTLE_TIMEOUT) -> int:
+    return await asyncio.to_thread(
+        run_async_script, driver, MORE_ITEMS_SCRIPT, timeout,
+        item_selector, more_selector, previous_count, quiet_ms, int(timeout * 1000)
+    )
+
+async def wait_for_list_quiet(driver, item_selector: str, quiet_ms: int = PAGE_SETTLE_QUIET_MS,
+                              timeout: float = PAGE_SETTLE_TIMEOUT) -> bool:
+    return await asyncio.to_thread(
+        run_async_script, driver, LIST_QUIET_SCRIPT, timeout, item_selector, quiet_ms, int(timeout * 1000)
+    )
+
+async def wait_for_network_idle(driver, quiet_ms: int = PAGE_SETTLE_QUIET_MS,
+                                timeout: float = PAGE_SETTLE_TIMEOUT) -> bool:
+    idle = await asyncio.to_thread(run_async_script, driver, NETWORK_IDLE_SCRIPT, timeout, quiet_ms, int(timeout * 1000))
+    if not idle:
+        logger.info(f"네트워크가 {timeout}초 안에 조용해지지 않아 계속 진행합니다.")
+    return idle
+
+# 페이지 이동 직후 고정 대기 대신 사용: 목록 항목이 나타나고, 목록을 채우는 요청과 목록의 DOM 변경이 끝나면 바로 반환
+async def wait_for_listing(driver, css_selector: str, timeout: float = TIMEOUT) -> None:
+    await wait_for_elements(driver, css_selector, timeout)
+    await wait_for_network_idle(driver)
+    await wait_for_list_quiet(driver, css_selector)
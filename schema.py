@@ -0,0 +1,99 @@
+from typing import List
+from logging_config import get_logger
+from title_normalizer import normalize_title, NORMALIZER_VERSION
+from config import TITLE_TRGM_FALLBACK
+
+logger = get_logger(__name__)
+
+trgm_enabled = False
+
+SCHEMA_STATEMENTS: List[str] = [
+    "ALTER TABLE movie ADD COLUMN IF NOT EXISTS normalized_title TEXT",
+    "CREATE INDEX IF NOT EXISTS movie_normalized_title_idx ON movie (normalized_title)",
+    "ALTER TABLE movie ADD COLUMN IF NOT EXISTS content_hash TEXT",
+    """
+    CREATE TABLE IF NOT EXISTS provider_sync_state (
+        provider_id INTEGER PRIMARY KEY,
+        high_water_mark TIMESTAMPTZ NOT NULL,
+        last_full_sync_at TIMESTAMPTZ
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS job_state (
+        job_name TEXT PRIMARY KEY,
+        last_success_at TIMESTAMPTZ,
+        last_attempt_at TIMESTAMPTZ,
+        last_status TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS stage_checkpoints (
+        run_id TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        payload JSONB NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (run_id, stage)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS stage_checkpoints_stage_idx ON stage_checkpoints (stage, created_at)",
+    """
+    CREATE TABLE IF NOT EXISTS schema_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+]
+
+TRGM_STATEMENTS: List[str] = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS movie_normalized_title_trgm_idx ON movie USING gin (normalized_title gin_trgm_ops)",
+]
+
+def is_trgm_enabled() -> bool:
+    return trgm_enabled
+
+# ALTER TABLE이 movie 테이블에 배타적 잠금을 잡으므로 작업 주기마다가 아니라 프로세스 시작 시 한 번만 호출한다
+async def ensure_schema(pool) -> None:
+    global trgm_enabled
+    async with pool.acquire() as conn:
+        for statement in SCHEMA_STATEMENTS:
+            await conn.execute(statement)
+
+        if TITLE_TRGM_FALLBACK:
+            try:
+                for statement in TRGM_STATEMENTS:
+                    await conn.execute(statement)
+                trgm_enabled = True
+            except Exception as e:
+                logger.warning(f"pg_trgm 설정 실패. 유사 제목 검색 없이 진행합니다: {e}")
+
+        await backfill_normalized_titles(conn)
+
+# normalized_title이 비어 있는 영화만 채우고, 정규화 규칙 버전이 바뀌었을 때만 전체를 다시 계산
+async def backfill_normalized_titles(conn) -> int:
+    stored_version = await conn.fetchval("SELECT value FROM schema_meta WHERE key = 'normalizer_version'")
+    recompute = stored_version != str(NORMALIZER_VERSION)
+    if recompute:
+        rows = await conn.fetch("SELECT id, title, normalized_title FROM movie")
+    else:
+        rows = await conn.fetch("SELECT id, title, normalized_title FROM movie WHERE normalized_title IS NULL")
+    changed = [(row['id'], key) for row in rows if (key := normalize_title(row['title'])) != row['normalized_title']]
+
+    async with conn.transaction():
+        if changed:
+            await conn.execute("""
+                UPDATE movie m
+                SET normalized_title = u.normalized_title
+                FROM unnest($1::int[], $2::text[]) AS u(id, normalized_title)
+                WHERE m.id = u.id
+            """, [movie_id for movie_id, _ in changed], [key for _, key in changed])
+        if recompute:
+            await conn.execute("""
+                INSERT INTO schema_meta (key, value) VALUES ('normalizer_version', $1)
+                ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+            """, str(NORMALIZER_VERSION))
+
+    if changed:
+        logger.info(f"{len(changed)}개 영화의 normalized_title 갱신 완료")
+    return len(changed)
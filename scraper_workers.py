@@ -0,0 +1,213 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from typing import Any, Awaitable, Callable, List, Optional
+import psutil
+from logging_config import setup_logging, get_logger
+from chrome_driver import close_driver_pool
+from config import (
+    SCRAPER_WORKERS_ENABLED, SCRAPER_WORKERS_MAX, SCRAPER_WORKER_MEMORY_MB, SCRAPER_WORKER_RSS_LIMIT_MB,
+    SCRAPER_TASK_TIMEOUT, SCRAPER_RSS_CHECK_INTERVAL
+)
+
+logger = get_logger(__name__)
+
+class ScraperWorkerError(Exception):
+    pass
+
+# 워커 프로세스 본체: 이벤트 루프와 DriverPool을 프로세스 안에서 계속 재사용한다
+# 요청은 (함수, 인자), 응답은 ('ok', 결과) 또는 ('error', 메시지)
+def worker_main(conn) -> None:
+    setup_logging()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+            func, args = request
+            try:
+                conn.send(('ok', loop.run_until_complete(func(*args))))
+            except Exception as e:
+                conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        loop.run_until_complete(close_driver_pool())
+        loop.close()
+
+def recommended_worker_count() -> int:
+    # 워커 하나가 브라우저까지 SCRAPER_WORKER_MEMORY_MB를 쓴다고 보고, 스케줄러 몫으로 CPU 하나를 남긴다
+    memory_workers = psutil.virtual_memory().available // (SCRAPER_WORKER_MEMORY_MB * 1024 * 1024)
+    cpu_workers = max((os.cpu_count() or 1) - 1, 1)
+    count = max(1, min(memory_workers, cpu_workers))
+    if SCRAPER_WORKERS_MAX:
+        count = min(count, SCRAPER_WORKERS_MAX)
+    return count
+
+class ScraperWorker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def rss(self) -> int:
+        # 워커가 띄운 chromedriver/Chrome 프로세스까지 합친 메모리 사용량
+        try:
+            process = psutil.Process(self.process.pid)
+            processes = [process] + process.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return 0
+        total = 0
+        for child in processes:
+            try:
+                total += child.memory_info().rss
+            except psutil.NoSuchProcess:
+                pass
+        return total
+
+    def kill(self) -> None:
+        try:
+            process = psutil.Process(self.process.pid)
+            for child in process.children(recursive=True):
+                child.kill()
+        except psutil.NoSuchProcess:
+            pass
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self, timeout: float = 30) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+# Selenium 스크래퍼를 스케줄러와 분리된 프로세스에서 실행하는 워커 풀
+# 결과는 제목 목록 같은 단순한 값만 IPC로 돌려받고,
+# 메모리(RSS)가 SCRAPER_WORKER_RSS_LIMIT_MB를 넘거나 시간이 초과된 워커는 Chrome까지 종료하고 새로 띄운다
+class ScraperWorkerPool:
+    def __init__(self, size: Optional[int] = None, rss_limit_mb: int = SCRAPER_WORKER_RSS_LIMIT_MB,
+                 task_timeout: float = SCRAPER_TASK_TIMEOUT):
+        self.size = size or recommended_worker_count()
+        self.rss_limit = rss_limit_mb * 1024 * 1024
+        self.task_timeout = task_timeout
+        self.replaced_count = 0
+        self._context = multiprocessing.get_context('spawn')
+        self._workers: List[ScraperWorker] = []
+        self._idle: Optional[asyncio.Queue] = None
+
+    async def _ensure_started(self) -> None:
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            worker = await asyncio.to_thread(ScraperWorker, self._context)
+            self._workers.append(worker)
+            self._idle.put_nowait(worker)
+        logger.info(f"스크래퍼 워커 {self.size}개 시작 (워커당 RSS 한도: {self.rss_limit // (1024 * 1024)}MB)")
+
+    async def _replace(self, worker: ScraperWorker, reason: str) -> ScraperWorker:
+        logger.warning(f"스크래퍼 워커 교체 (pid: {worker.process.pid}): {reason}")
+        await asyncio.to_thread(worker.kill)
+        if self._idle is None:
+            # 작업 중에 close()된 풀에는 새 워커를 띄우지 않는다
+            return worker
+        self._workers.remove(worker)
+        replacement = await asyncio.to_thread(ScraperWorker, self._context)
+        self._workers.append(replacement)
+        self.replaced_count += 1
+        return replacement
+
+    async def _wait_readable(self, worker: ScraperWorker, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        loop.add_reader(worker.conn.fileno(), ready.set)
+        try:
+            await asyncio.wait_for(ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(worker.conn.fileno())
+
+    async def _call(self, worker: ScraperWorker, func: Callable[..., Awaitable[Any]], args: tuple) -> Any:
+        worker.conn.send((func, args))
+        started_at = time.monotonic()
+        while True:
+            if await self._wait_readable(worker, SCRAPER_RSS_CHECK_INTERVAL):
+                status, value = worker.conn.recv()
+                if status == 'error':
+                    raise ScraperWorkerError(value)
+                return value
+            if not worker.process.is_alive():
+                raise ScraperWorkerError(f"워커 프로세스 종료 (exit code: {worker.process.exitcode})")
+            rss = worker.rss()
+            if rss > self.rss_limit:
+                raise MemoryError(f"RSS {rss // (1024 * 1024)}MB가 한도를 넘음")
+            if time.monotonic() - started_at > self.task_timeout:
+                raise asyncio.TimeoutError(f"{self.task_timeout}초 안에 끝나지 않음")
+
+    async def run(self, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        await self._ensure_started()
+        worker = await self._idle.get()
+        try:
+            return await self._call(worker, func, args)
+        except ScraperWorkerError:
+            if not worker.process.is_alive():
+                worker = await self._replace(worker, "프로세스 종료")
+            raise
+        except (MemoryError, asyncio.TimeoutError, asyncio.CancelledError, EOFError, OSError) as e:
+            # 응답을 기다리던 중 멈춘 워커는 요청/응답 순서가 어긋나므로 재사용하지 않는다
+            reason = str(e) or type(e).__name__
+            worker = await self._replace(worker, reason)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise ScraperWorkerError(f"{getattr(func, '__name__', func)} 실행 실패: {reason}") from e
+        finally:
+            if self._idle is None:
+                # 작업 중에 close()된 풀: 돌려놓을 곳이 없으므로 워커를 종료한다
+                if worker.process.is_alive():
+                    await asyncio.to_thread(worker.kill)
+            else:
+                # 작업이 끝난 뒤에도 유휴 Chrome이 메모리를 계속 잡고 있으면 교체
+                if worker.process.is_alive() and worker.rss() > self.rss_limit:
+                    worker = await self._replace(worker, "작업 후 RSS 한도 초과")
+                self._idle.put_nowait(worker)
+
+    async def close(self) -> None:
+        workers, self._workers = self._workers, []
+        self._idle = None
+        for worker in workers:
+            await asyncio.to_thread(worker.stop)
+        if workers:
+            logger.info(f"스크래퍼 워커 {len(workers)}개 종료 (교체된 워커: {self.replaced_count}개)")
+
+scraper_workers: Optional[ScraperWorkerPool] = None
+
+def get_scraper_workers() -> ScraperWorkerPool:
+    global scraper_workers
+    if not scraper_workers:
+        scraper_workers = ScraperWorkerPool()
+    return scraper_workers
+
+async def close_scraper_workers() -> None:
+    global scraper_workers
+    if scraper_workers:
+        await scraper_workers.close()
+        scraper_workers = None
+
+# 워커 풀이 꺼져 있으면 현재 프로세스에서 바로 실행
+async def run_scraper(func: Callable[..., Awaitable[Any]], *args) -> Any:
+    if not SCRAPER_WORKERS_ENABLED:
+        return await func(*args)
+    return await get_scraper_workers().run(func, *args)
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# 테스트는 DB에 연결하지 않지만 config.py가 import 시점에 읽는 값은 채워 둔다
+os.environ.setdefault('DB_PORT', '5432')
+os.environ.setdefault('DB_PASSWORD', 'test')
+os.environ.setdefault('TMDB_API_KEY', 'test')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
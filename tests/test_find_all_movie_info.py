@@ -0,0 +1,91 @@
+import asyncio
+from contextlib import asynccontextmanager
+import find_all_movie_info
+import scraper_workers
+from update_ended_movies import update_ended
+
+def listings(monkeypatch, **overrides):
+    monkeypatch.setattr(scraper_workers, 'SCRAPER_WORKERS_ENABLED', False)
+    defaults = {
+        'get_cgv_released_movie': ['에이리언: 로물루스'],
+        'get_cgv_releasing_movie': ['테리파이어 3 (자막)'],
+        'get_lotte_released_info': ['스마일 2'],
+        'get_lotte_upcoming_info': ['트랩'],
+    }
+    for name, titles in {**defaults, **overrides}.items():
+        async def fetch(titles=titles):
+            if isinstance(titles, Exception):
+                raise titles
+            return titles
+        monkeypatch.setattr(find_all_movie_info, name, fetch)
+
+def test_all_listings_complete(monkeypatch):
+    listings(monkeypatch)
+    cgv, lotte, incomplete = asyncio.run(find_all_movie_info.get_all_movie_info())
+    assert cgv == ['에이리언: 로물루스', '테리파이어 3']
+    assert lotte == ['스마일 2', '트랩']
+    assert incomplete == []
+
+def test_failed_listing_marks_chain_incomplete(monkeypatch):
+    listings(monkeypatch, get_cgv_released_movie=RuntimeError("타임아웃"))
+    cgv, lotte, incomplete = asyncio.run(find_all_movie_info.get_all_movie_info())
+    # 개봉 예정작만 남은 CGV 목록은 상영 정보 추가에만 쓸 수 있다
+    assert cgv == ['테리파이어 3']
+    assert lotte == ['스마일 2', '트랩']
+    assert incomplete == ['CGV']
+
+class FakeConnection:
+    def __init__(self, deleted_theaters):
+        self.deleted_theaters = deleted_theaters
+
+    async def fetch(self, query, *args):
+        if 'FROM theaters' in query:
+            return [{'id': 1, 'name': 'CGV'}, {'id': 2, 'name': '롯데시네마'}]
+        self.deleted_theaters.append(args[1])
+        return []
+
+class FakePool:
+    def __init__(self):
+        self.deleted_theaters = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self.deleted_theaters)
+
+def test_update_ended_skips_incomplete_chains():
+    pool = FakePool()
+    asyncio.run(update_ended(pool, ['테리파이어 3'], ['스마일 2', '트랩'], ['CGV']))
+    assert pool.deleted_theaters == [2]
+
+def test_update_ended_runs_for_complete_chains():
+    pool = FakePool()
+    asyncio.run(update_ended(pool, ['에이리언: 로물루스'], ['스마일 2']))
+    assert pool.deleted_theaters == [1, 2]
+
+class FakeCheckpoints:
+    def __init__(self):
+        self.saved = {}
+
+    async def save(self, stage, payload):
+        self.saved[stage] = payload
+
+def test_partial_scrape_is_not_checkpointed(monkeypatch):
+    import update_scheduler
+
+    async def partial_scrape():
+        return ['테리파이어 3'], ['스마일 2'], ['CGV']
+    monkeypatch.setattr(update_scheduler, 'get_all_movie_info', partial_scrape)
+    checkpoints = FakeCheckpoints()
+    result = asyncio.run(update_scheduler.update_all_movie_info(checkpoints))
+    assert result == (['테리파이어 3'], ['스마일 2'], ['CGV'])
+    assert checkpoints.saved == {}
+
+def test_complete_scrape_is_checkpointed(monkeypatch):
+    import update_scheduler
+
+    async def full_scrape():
+        return ['에이리언: 로물루스'], ['스마일 2'], []
+    monkeypatch.setattr(update_scheduler, 'get_all_movie_info', full_scrape)
+    checkpoints = FakeCheckpoints()
+    asyncio.run(update_scheduler.update_all_movie_info(checkpoints))
+    assert checkpoints.saved == {'scrape': {'cgv': ['에이리언: 로물루스'], 'lotte': ['스마일 2']}}
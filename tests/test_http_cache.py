@@ -0,0 +1,100 @@
+import asyncio
+import itertools
+import random
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import http_cache
+from http_cache import HttpCache
+from tmdb_client import TMDBClient
+
+LAST_MODIFIED = 'Wed, 01 Oct 2026 00:00:00 GMT'
+
+def create_app(requests):
+    async def etag_handler(request):
+        requests.append(('etag', dict(request.headers)))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304, headers={'ETag': '"v1"'})
+        return web.json_response({'id': 1, 'title': '에이리언'}, headers={'ETag': '"v1"'})
+
+    async def modified_handler(request):
+        requests.append(('modified', dict(request.headers)))
+        if request.headers.get('If-Modified-Since') == LAST_MODIFIED:
+            return web.Response(status=304)
+        return web.json_response({'id': 2, 'title': '피라냐 3D'}, headers={'Last-Modified': LAST_MODIFIED})
+
+    async def plain_handler(request):
+        requests.append(('plain', dict(request.headers)))
+        return web.json_response({'id': 3})
+
+    app = web.Application()
+    app.router.add_get('/etag', etag_handler)
+    app.router.add_get('/modified', modified_handler)
+    app.router.add_get('/plain', plain_handler)
+    return app
+
+async def fetch_twice(tmp_path, path):
+    requests = []
+    cache = HttpCache(str(tmp_path / 'cache.sqlite3'))
+    client = TMDBClient(rate=1000, burst=100, cache=cache)
+    async with TestServer(create_app(requests)) as server:
+        url = str(server.make_url(path))
+        try:
+            first = await client.get_json(url, {'language': 'ko-KR'})
+            second = await client.get_json(url, {'language': 'ko-KR'})
+        finally:
+            stats = cache.stats()
+            await client.close()
+    return first, second, requests, stats
+
+def test_etag_revalidation_returns_cached_body(tmp_path):
+    first, second, requests, stats = asyncio.run(fetch_twice(tmp_path, '/etag'))
+    assert first == second == {'id': 1, 'title': '에이리언'}
+    assert 'If-None-Match' not in requests[0][1]
+    assert requests[1][1]['If-None-Match'] == '"v1"'
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert stats['hit_rate'] == 0.5
+
+def test_last_modified_revalidation_returns_cached_body(tmp_path):
+    first, second, requests, stats = asyncio.run(fetch_twice(tmp_path, '/modified'))
+    assert first == second == {'id': 2, 'title': '피라냐 3D'}
+    assert requests[1][1]['If-Modified-Since'] == LAST_MODIFIED
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+def test_response_without_validators_is_not_cached(tmp_path):
+    first, second, requests, stats = asyncio.run(fetch_twice(tmp_path, '/plain'))
+    assert first == second == {'id': 3}
+    assert all('If-None-Match' not in headers and 'If-Modified-Since' not in headers for _, headers in requests)
+    assert (stats['hits'], stats['misses']) == (0, 2)
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(http_cache.time, 'time', lambda: next(clock))
+    body = random.Random(0).randbytes(1024)  # 압축해도 크기가 거의 줄지 않는 본문
+
+    async def scenario():
+        cache = HttpCache(str(tmp_path / 'cache.sqlite3'), max_bytes=len(body) * 2 + 100)
+        try:
+            await cache.put('https://api.example.com/movie/1', '"a"', None, body)
+            await cache.put('https://api.example.com/movie/2', '"b"', None, body)
+            await cache.record_hit('https://api.example.com/movie/1')
+            await cache.put('https://api.example.com/movie/3', '"c"', None, body)
+            kept = [await cache.get(f'https://api.example.com/movie/{movie_id}') for movie_id in (1, 2, 3)]
+            return kept, cache.stats()
+        finally:
+            cache.close()
+
+    kept, stats = asyncio.run(scenario())
+    assert [entry.etag if entry else None for entry in kept] == ['"a"', None, '"c"']
+    assert kept[0].body == body
+    assert stats['evictions'] == 1
+
+def test_cache_key_ignores_query_order(tmp_path):
+    async def scenario():
+        cache = HttpCache(str(tmp_path / 'cache.sqlite3'))
+        try:
+            await cache.put('https://API.example.com/movie?b=2&a=1', '"v"', None, b'{}')
+            return await cache.get('https://api.example.com/movie?a=1&b=2')
+        finally:
+            cache.close()
+
+    assert asyncio.run(scenario()).etag == '"v"'
@@ -0,0 +1,157 @@
+import asyncio
+import json
+from pathlib import Path
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import cgv_movie_info
+import lotte_movie_info
+import megabox_movie_info
+from http_scraper import fetch_html_titles, fetch_paged_json_titles, parse_selector
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+def fixture_app(requests, movies):
+    async def html_handler(request):
+        requests.append(('html', request.match_info['name']))
+        return web.Response(text=(FIXTURES / request.match_info['name']).read_text(encoding='utf-8'),
+                            content_type='text/html')
+
+    async def lotte_handler(request):
+        param_list = json.loads((await request.post())['paramList'])
+        requests.append(('lotte', param_list['pageNo']))
+        size, page = param_list['blockSize'], param_list['pageNo']
+        items = [{'MovieNameKR': title} for title in movies[(page - 1) * size:page * size]]
+        # 롯데시네마 API는 JSON을 text/html로 보낸다
+        return web.Response(text=json.dumps({'Movies': {'Items': items}}), content_type='text/html')
+
+    async def megabox_handler(request):
+        body = await request.json()
+        requests.append(('megabox', body['currentPage']))
+        size, page = int(body['recordCountPerPage']), int(body['currentPage'])
+        return web.json_response({'movieList': [{'movieNm': title} for title in movies[(page - 1) * size:page * size]]})
+
+    app = web.Application()
+    app.router.add_get('/html/{name}', html_handler)
+    app.router.add_post('/lotte', lotte_handler)
+    app.router.add_post('/megabox', megabox_handler)
+    return app
+
+async def with_server(movies, scenario):
+    requests = []
+    async with TestServer(fixture_app(requests, movies)) as server:
+        result = await scenario(lambda path: str(server.make_url(path)))
+    return result, requests
+
+def selenium_fallback(monkeypatch, module, calls):
+    async def get_movie_titles(*args, **kwargs):
+        calls.append(args)
+        return ['셀레니움 결과']
+    monkeypatch.setattr(module, 'get_movie_titles', get_movie_titles)
+
+def test_parse_selector():
+    assert parse_selector('div.btm_info > strong') == [(' ', 'div', ('btm_info',)), ('>', 'strong', ())]
+    assert parse_selector('p.tit') == [(' ', 'p', ('tit',))]
+
+@pytest.mark.parametrize('name, selector, expected', [
+    ('cgv_listing.html', 'strong.title', ['에이리언: 로물루스', '롱레그스', "Tom & Jerry's Halloween"]),
+    ('lotte_released.html', 'div.btm_info > strong', ['스마일 2', '트랩']),
+    ('megabox_upcoming.html', 'p.tit', ['테리파이어 3', '사다코 DX (자막)']),
+])
+def test_fetch_html_titles_from_fixture(name, selector, expected):
+    titles, _ = asyncio.run(with_server([], lambda url: fetch_html_titles(url(f'/html/{name}'), selector)))
+    assert titles == expected
+
+def test_paged_json_reads_until_short_page():
+    movies = [f'영화 {i}' for i in range(5)]
+
+    async def scenario(url):
+        return await fetch_paged_json_titles(
+            url('/megabox'), ['movieList'], 'movieNm', 2,
+            lambda page: {'json_body': {'currentPage': str(page), 'recordCountPerPage': '2'}}
+        )
+
+    titles, requests = asyncio.run(with_server(movies, scenario))
+    assert titles == movies
+    assert requests == [('megabox', '1'), ('megabox', '2'), ('megabox', '3')]
+
+def test_paged_json_rejects_unfinished_listing():
+    async def scenario(url):
+        return await fetch_paged_json_titles(
+            url('/megabox'), ['movieList'], 'movieNm', 2,
+            lambda page: {'json_body': {'currentPage': str(page), 'recordCountPerPage': '2'}},
+            max_pages=2
+        )
+
+    with pytest.raises(ValueError):
+        asyncio.run(with_server([f'영화 {i}' for i in range(6)], scenario))
+
+def test_lotte_upcoming_api_paginates(monkeypatch):
+    movies = [f'개봉 예정 {i}' for i in range(5)]
+    monkeypatch.setattr(lotte_movie_info, 'LOTTE_API_PAGE_SIZE', 2)
+
+    async def scenario(url):
+        monkeypatch.setattr(lotte_movie_info, 'LOTTE_MOVIE_API_URL', url('/lotte'))
+        return await lotte_movie_info.get_lotte_upcoming_info()
+
+    titles, requests = asyncio.run(with_server(movies, scenario))
+    assert titles == movies
+    assert [page for _, page in requests] == [1, 2, 3]
+
+def test_lotte_upcoming_without_api_uses_selenium(monkeypatch):
+    calls = []
+    selenium_fallback(monkeypatch, lotte_movie_info, calls)
+    monkeypatch.setattr(lotte_movie_info, 'LOTTE_MOVIE_API_URL', None)
+    assert asyncio.run(lotte_movie_info.get_lotte_upcoming_info()) == ['셀레니움 결과']
+    assert len(calls) == 1
+
+def test_lotte_released_without_api_parses_html(monkeypatch):
+    calls = []
+    selenium_fallback(monkeypatch, lotte_movie_info, calls)
+    monkeypatch.setattr(lotte_movie_info, 'LOTTE_MOVIE_API_URL', None)
+
+    async def scenario(url):
+        monkeypatch.setattr(lotte_movie_info, 'LOTTE_RELEASED_URL', url('/html/lotte_released.html'))
+        return await lotte_movie_info.get_lotte_released_info()
+
+    titles, _ = asyncio.run(with_server([], scenario))
+    assert titles == ['스마일 2', '트랩']
+    assert calls == []
+
+def test_megabox_released_api_paginates(monkeypatch):
+    movies = [f'상영작 {i}' for i in range(4)]
+    monkeypatch.setattr(megabox_movie_info, 'MEGABOX_API_PAGE_SIZE', 2)
+
+    async def scenario(url):
+        monkeypatch.setattr(megabox_movie_info, 'MEGABOX_MOVIE_API_URL', url('/megabox'))
+        return await megabox_movie_info.get_megabox_released_info()
+
+    titles, requests = asyncio.run(with_server(movies, scenario))
+    assert titles == movies
+    assert [page for _, page in requests] == ['1', '2', '3']
+
+def test_megabox_released_without_api_uses_selenium(monkeypatch):
+    calls = []
+    selenium_fallback(monkeypatch, megabox_movie_info, calls)
+    monkeypatch.setattr(megabox_movie_info, 'MEGABOX_MOVIE_API_URL', None)
+    assert asyncio.run(megabox_movie_info.get_megabox_released_info()) == ['셀레니움 결과']
+    assert len(calls) == 1
+
+def test_cgv_released_with_click_selector_uses_selenium(monkeypatch):
+    calls = []
+    selenium_fallback(monkeypatch, cgv_movie_info, calls)
+    monkeypatch.setattr(cgv_movie_info, 'CGV_RELEASED_CLICK_SELECTOR', 'a.btn-more-fontbold')
+    assert asyncio.run(cgv_movie_info.get_cgv_released_movie()) == ['셀레니움 결과']
+    assert calls == [(cgv_movie_info.CGV_RELEASED_URL, 'a.btn-more-fontbold')]
+
+def test_cgv_releasing_parses_html(monkeypatch):
+    calls = []
+    selenium_fallback(monkeypatch, cgv_movie_info, calls)
+
+    async def scenario(url):
+        monkeypatch.setattr(cgv_movie_info, 'CGV_RELEASING_URL', url('/html/cgv_listing.html'))
+        return await cgv_movie_info.get_cgv_releasing_movie()
+
+    titles, _ = asyncio.run(with_server([], scenario))
+    assert titles == ['에이리언: 로물루스', '롱레그스', "Tom & Jerry's Halloween"]
+    assert calls == []
@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+import update_netflix_expiring_movie
+from job_dag import JobDAG
+
+def run_netflix_job(monkeypatch, scrape):
+    monkeypatch.setattr(update_netflix_expiring_movie, 'run_scraper', scrape)
+    dag = JobDAG({'browser': 1})
+    dag.add('netflix', lambda: update_netflix_expiring_movie.update_netflix_expiring_movie(pool=None), 'browser')
+    return asyncio.run(dag.run())['netflix']
+
+def test_empty_netflix_scrape_is_recorded_as_failure(monkeypatch):
+    async def scrape(func):
+        return []
+    result = run_netflix_job(monkeypatch, scrape)
+    assert result.status == 'failed'
+    assert isinstance(result.error, RuntimeError)
+
+def test_netflix_scrape_error_is_recorded_as_failure(monkeypatch):
+    async def scrape(func):
+        raise TimeoutError("페이지 로딩 시간 초과")
+    result = run_netflix_job(monkeypatch, scrape)
+    assert result.status == 'failed'
+    assert isinstance(result.error, TimeoutError)
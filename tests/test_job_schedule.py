@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+from job_schedule import due_jobs, next_due_at, seconds_until_next_job
+from config import JOB_INTERVAL_HOURS, JOB_RETRY_DELAY
+
+NOW = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+def job(status, success_hours_ago=None, attempt_hours_ago=0.0):
+    return {
+        'last_success_at': NOW - timedelta(hours=success_hours_ago) if success_hours_ago is not None else None,
+        'last_attempt_at': NOW - timedelta(hours=attempt_hours_ago),
+        'last_status': status,
+    }
+
+def test_failed_tail_brings_scrape_forward_to_retry_delay():
+    state = {
+        'scrape': job('success', success_hours_ago=2, attempt_hours_ago=2),
+        'theaters_info': job('failed', attempt_hours_ago=2),
+        'ended': job('success', success_hours_ago=2, attempt_hours_ago=2),
+    }
+    retry_at = NOW - timedelta(hours=2) + timedelta(seconds=JOB_RETRY_DELAY)
+    assert next_due_at('scrape', state, NOW) == retry_at
+    assert ('scrape' in due_jobs(state, NOW)) == (retry_at <= NOW)
+
+def test_successful_tails_keep_regular_interval():
+    state = {
+        'scrape': job('success', success_hours_ago=2, attempt_hours_ago=2),
+        'theaters_info': job('success', success_hours_ago=2, attempt_hours_ago=2),
+        'ended': job('success', success_hours_ago=2, attempt_hours_ago=2),
+    }
+    assert next_due_at('scrape', state, NOW) == NOW - timedelta(hours=2) + timedelta(hours=JOB_INTERVAL_HOURS['scrape'])
+
+def test_seconds_until_next_job_includes_tail_retry():
+    state = {name: job('success', success_hours_ago=0, attempt_hours_ago=0) for name in JOB_INTERVAL_HOURS}
+    state['ended'] = job('skipped', attempt_hours_ago=0)
+    assert seconds_until_next_job(state, NOW) == JOB_RETRY_DELAY
+
+def test_never_run_job_is_due():
+    assert next_due_at('providers', {}, NOW) == NOW
@@ -0,0 +1,246 @@
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import tmdb_client
+import update_movie_provider
+from tmdb_client import TMDBClient
+from update_movie_provider import (
+    consume_provider_movies, full_sync_providers, incremental_sync_providers, map_watch_providers, needs_full_sync
+)
+from config import PROVIDER_MAPPING
+
+SYNCED_AT = datetime(2026, 10, 10, 3, 0, tzinfo=timezone.utc)
+
+# /movie/changes 두 페이지와 영화별 watch/providers 응답
+CHANGES = {
+    1: {'page': 1, 'total_pages': 2, 'results': [{'id': 100}, {'id': 101}]},
+    2: {'page': 2, 'total_pages': 2, 'results': [{'id': 102}, {'id': 101}]},
+}
+WATCH_PROVIDERS = {
+    # 넷플릭스(8)와 웨이브(356)에서 제공, 매핑에 없는 공급자와 다른 지역은 무시
+    100: {'id': 100, 'results': {
+        'KR': {'link': 'https://example.com', 'flatrate': [{'provider_id': 8}, {'provider_id': 9999}],
+               'rent': [{'provider_id': 356}]},
+        'US': {'flatrate': [{'provider_id': 337}]},
+    }},
+    # 더 이상 국내에서 제공되지 않음
+    102: {'id': 102, 'results': {'US': {'flatrate': [{'provider_id': 8}]}}},
+}
+# 저장되지 않은 영화의 상세 정보 (101은 넷플릭스에서 제공하는 새 공포 영화, 103은 공포 영화가 아님, 104는 삭제되어 404)
+DETAILS = {
+    101: {'id': 101, 'title': '새 공포 영화', 'release_date': '2026-10-01', 'overview': '', 'poster_path': '/new.jpg',
+          'adult': False, 'genres': [{'id': 27, 'name': '공포'}],
+          'watch/providers': {'results': {'KR': {'flatrate': [{'provider_id': 8}]}}}},
+    103: {'id': 103, 'title': '드라마', 'release_date': '2026-10-01', 'overview': '', 'poster_path': '/drama.jpg',
+          'adult': False, 'genres': [{'id': 18, 'name': '드라마'}],
+          'watch/providers': {'results': {'KR': {'flatrate': [{'provider_id': 8}]}}}},
+}
+# DB에 저장된 공포 영화
+KNOWN_MOVIES = [{'id': 1, 'the_movie_db_id': 100}, {'id': 2, 'the_movie_db_id': 102}]
+
+class FakeConnection:
+    def __init__(self, calls, movies):
+        self.calls = calls
+        self.movies = movies
+
+    async def fetch(self, query, *args):
+        self.calls.append(('fetch', ' '.join(query.split()), args))
+        return [movie for movie in self.movies if movie['the_movie_db_id'] in args[0]]
+
+    async def execute(self, query, *args):
+        self.calls.append(('execute', ' '.join(query.split()), args))
+        return 'OK'
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.calls.append(('begin', None, ()))
+        yield
+        self.calls.append(('commit', None, ()))
+
+class FakePool:
+    def __init__(self):
+        self.calls = []
+        self.movies = list(KNOWN_MOVIES)
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection(self.calls, self.movies)
+
+# 병합한 영화를 저장된 영화 목록에 추가한다
+async def fake_merge_movie_records(conn, records):
+    conn.calls.append(('merge', None, (records,)))
+    for record in records:
+        conn.movies.append({'id': len(conn.movies) + 1, 'the_movie_db_id': record[0]})
+    return {'inserted': len(records), 'updated': 0, 'unchanged': 0}
+
+def create_app(requests):
+    async def changes_handler(request):
+        requests.append(('changes', dict(request.query)))
+        return web.json_response(CHANGES[int(request.query['page'])])
+
+    async def providers_handler(request):
+        movie_id = int(request.match_info['movie_id'])
+        requests.append(('watch_providers', movie_id))
+        return web.json_response(WATCH_PROVIDERS[movie_id])
+
+    async def details_handler(request):
+        movie_id = int(request.match_info['movie_id'])
+        requests.append(('details', movie_id))
+        if movie_id not in DETAILS:
+            return web.json_response({'success': False}, status=404)
+        return web.json_response(DETAILS[movie_id])
+
+    app = web.Application()
+    app.router.add_get('/movie/changes', changes_handler)
+    app.router.add_get('/movie/{movie_id}/watch/providers', providers_handler)
+    app.router.add_get('/movie/{movie_id}', details_handler)
+    return app
+
+def run_incremental_sync(monkeypatch, sync_state):
+    requests = []
+    pool = FakePool()
+    monkeypatch.setattr(update_movie_provider, 'HORROR_GENRE_ID', '27')
+    monkeypatch.setattr(update_movie_provider, 'merge_movie_records', fake_merge_movie_records)
+
+    async def scenario():
+        async with TestServer(create_app(requests)) as server:
+            monkeypatch.setattr(tmdb_client, 'TMDB_API_ROOT', str(server.make_url('')).rstrip('/'))
+            client = TMDBClient(rate=1000, burst=100)
+            try:
+                await incremental_sync_providers(pool, client, sync_state, SYNCED_AT)
+            finally:
+                await client.close()
+
+    asyncio.run(scenario())
+    return requests, pool.calls
+
+def sync_state_for(high_water_marks):
+    return {
+        mapped_provider_id: {
+            'provider_id': mapped_provider_id,
+            'high_water_mark': high_water_marks.get(mapped_provider_id, SYNCED_AT - timedelta(days=1)),
+            'last_full_sync_at': SYNCED_AT - timedelta(days=7),
+        }
+        for mapped_provider_id in PROVIDER_MAPPING.values()
+    }
+
+def test_map_watch_providers_uses_region_and_mapping():
+    assert map_watch_providers(WATCH_PROVIDERS[100]) == [PROVIDER_MAPPING[8], PROVIDER_MAPPING[356]]
+    assert map_watch_providers(WATCH_PROVIDERS[102]) == []
+    assert map_watch_providers({}) == []
+
+def test_incremental_sync_reconciles_changed_movies(monkeypatch):
+    oldest = SYNCED_AT - timedelta(days=3)
+    requests, calls = run_incremental_sync(monkeypatch, sync_state_for({PROVIDER_MAPPING[337]: oldest}))
+
+    # 가장 오래된 high-water mark부터 동기화 시각까지 변경 피드를 모든 페이지 조회
+    changes = [query for kind, query in requests if kind == 'changes']
+    assert sorted(query['page'] for query in changes) == ['1', '2']
+    assert {(query['start_date'], query['end_date']) for query in changes} == {('2026-10-07', '2026-10-10')}
+
+    # 저장된 영화는 공급자 정보만, 저장되지 않은 영화는 상세 정보와 공급자 정보를 함께 조회
+    assert sorted(movie_id for kind, movie_id in requests if kind == 'watch_providers') == [100, 102]
+    assert [movie_id for kind, movie_id in requests if kind == 'details'] == [101]
+    lookup = next(args for kind, _, args in calls if kind == 'fetch')
+    assert sorted(lookup[0]) == [100, 101, 102]
+
+    # 새 공포 영화는 영화로 병합하고 공급자 관계도 함께 추가
+    merged = next(args[0] for kind, _, args in calls if kind == 'merge')
+    assert [(record[0], record[1]) for record in merged] == [(101, '새 공포 영화')]
+
+    executes = [(query, args) for kind, query, args in calls if kind == 'execute']
+    assert len(executes) == 3
+    (delete_query, delete_args), (insert_query, insert_args), (state_query, state_args) = executes
+
+    # 변경된 영화의 관계 중 현재 응답에 없는 것만 삭제 (102는 모든 관계 삭제)
+    current = [(1, PROVIDER_MAPPING[8]), (1, PROVIDER_MAPPING[356]), (3, PROVIDER_MAPPING[8])]
+    assert delete_query.startswith('DELETE FROM movie_providers')
+    changed_movie_ids, provider_ids, current_movie_ids, current_provider_ids = delete_args
+    assert sorted(changed_movie_ids) == [1, 2, 3]
+    assert provider_ids == list(PROVIDER_MAPPING.values())
+    assert sorted(zip(current_movie_ids, current_provider_ids)) == current
+
+    assert insert_query.startswith('INSERT INTO movie_providers')
+    assert sorted(zip(*insert_args)) == current
+
+    # 모든 공급자의 high-water mark를 이번 동기화 시각으로 올리고 전체 동기화 시각은 그대로 둔다
+    assert state_query.startswith('INSERT INTO provider_sync_state')
+    assert state_args == (list(PROVIDER_MAPPING.values()), SYNCED_AT, False)
+
+    kinds = [kind for kind, _, _ in calls]
+    assert kinds.index('begin') < kinds.index('execute') and kinds[-1] == 'commit'
+
+# 저장된 영화도 새 공포 영화도 없으면 high-water mark만 올린다
+def test_incremental_sync_without_horror_movies_only_advances_high_water_mark(monkeypatch):
+    monkeypatch.setitem(CHANGES, 1, {'page': 1, 'total_pages': 1, 'results': [{'id': 103}, {'id': 104}]})
+    requests, calls = run_incremental_sync(monkeypatch, sync_state_for({}))
+
+    assert sorted(requests[1:]) == [('details', 103), ('details', 104)]
+    assert not any(kind == 'merge' for kind, _, _ in calls)
+    executes = [(query, args) for kind, query, args in calls if kind == 'execute']
+    assert len(executes) == 1
+    assert executes[0][0].startswith('INSERT INTO provider_sync_state')
+    assert executes[0][1] == (list(PROVIDER_MAPPING.values()), SYNCED_AT, False)
+
+def test_needs_full_sync(monkeypatch):
+    monkeypatch.setattr(update_movie_provider, 'PROVIDER_SYNC_MODE', 'auto')
+    assert not needs_full_sync(sync_state_for({}), SYNCED_AT)
+    assert needs_full_sync({}, SYNCED_AT)
+
+    # 변경 피드 조회 기간(14일)을 넘긴 high-water mark
+    stale = sync_state_for({PROVIDER_MAPPING[8]: SYNCED_AT - timedelta(days=15)})
+    assert needs_full_sync(stale, SYNCED_AT)
+
+    # 주기적인 전체 동기화
+    old_full_sync = sync_state_for({})
+    old_full_sync[PROVIDER_MAPPING[96]]['last_full_sync_at'] = SYNCED_AT - timedelta(days=40)
+    assert needs_full_sync(old_full_sync, SYNCED_AT)
+
+    monkeypatch.setattr(update_movie_provider, 'PROVIDER_SYNC_MODE', 'full')
+    assert needs_full_sync(sync_state_for({}), SYNCED_AT)
+
+# 병합이 실패하면 큐가 가득 찬 채로 조회 작업을 취소해도 멈추지 않고 정리된 뒤 오류를 올린다
+def test_full_sync_stops_producers_when_merge_fails(monkeypatch):
+    monkeypatch.setattr(update_movie_provider, 'PIPELINE_QUEUE_SIZE', 1)
+
+    async def produce_provider_movies(client, provider_id, queue, checkpoints=None):
+        for _ in range(5):
+            await queue.put((PROVIDER_MAPPING[provider_id], []))
+        return True
+
+    async def failing_merge(conn, records):
+        await asyncio.sleep(0.01)
+        raise RuntimeError('병합 실패')
+
+    monkeypatch.setattr(update_movie_provider, 'produce_provider_movies', produce_provider_movies)
+    monkeypatch.setattr(update_movie_provider, 'merge_movie_records', failing_merge)
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match='병합 실패'):
+            await asyncio.wait_for(full_sync_providers(FakePool(), None, SYNCED_AT), timeout=5)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(scenario()) == []
+
+# 여러 공급자에 있는 영화는 한 번만 병합으로 넘기고 공급자 관계는 모두 기록한다
+def test_consume_provider_movies_yields_each_movie_once():
+    movie = {'the_movie_db_id': 100, 'title': '공포 영화', 'release_date': None, 'overview': '',
+             'poster_path': '', 'is_theatrical_release': False}
+    copied = []
+
+    class CopyConnection:
+        async def copy_records_to_table(self, table, records):
+            copied.extend(records)
+
+    async def scenario():
+        queue = asyncio.Queue()
+        for item in [(PROVIDER_MAPPING[8], [movie]), (PROVIDER_MAPPING[356], [movie]), None]:
+            queue.put_nowait(item)
+        return [record async for record in consume_provider_movies(CopyConnection(), queue)]
+
+    records = asyncio.run(scenario())
+    assert [record[0] for record in records] == [100]
+    assert sorted(copied) == sorted([(100, PROVIDER_MAPPING[8]), (100, PROVIDER_MAPPING[356])])
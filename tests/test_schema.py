@@ -0,0 +1,48 @@
+import asyncio
+from contextlib import asynccontextmanager
+from schema import backfill_normalized_titles
+from title_normalizer import NORMALIZER_VERSION
+
+MOVIES = [
+    {'id': 1, 'title': '에이리언: 로물루스', 'normalized_title': None},
+    {'id': 2, 'title': '듄', 'normalized_title': 'stale'},
+]
+
+class FakeConnection:
+    def __init__(self, stored_version):
+        self.stored_version = stored_version
+        self.calls = []
+
+    async def fetchval(self, query, *args):
+        return self.stored_version
+
+    async def fetch(self, query, *args):
+        self.calls.append(('fetch', ' '.join(query.split()), args))
+        if 'IS NULL' in query:
+            return [movie for movie in MOVIES if movie['normalized_title'] is None]
+        return MOVIES
+
+    async def execute(self, query, *args):
+        self.calls.append(('execute', ' '.join(query.split()), args))
+        return 'OK'
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+# 규칙 버전이 같으면 비어 있는 제목만 채우고 버전은 다시 저장하지 않는다
+def test_backfill_only_fills_missing_titles_when_version_unchanged():
+    conn = FakeConnection(str(NORMALIZER_VERSION))
+    assert asyncio.run(backfill_normalized_titles(conn)) == 1
+    assert 'IS NULL' in conn.calls[0][1]
+    updates = [call for call in conn.calls if call[1].startswith('UPDATE movie')]
+    assert updates[0][2][0] == [1]
+    assert not any('schema_meta' in call[1] for call in conn.calls)
+
+# 규칙 버전이 바뀌면 전체를 다시 계산하고 새 버전을 저장한다
+def test_backfill_recomputes_all_titles_when_version_changes():
+    conn = FakeConnection(None)
+    assert asyncio.run(backfill_normalized_titles(conn)) == 2
+    assert 'IS NULL' not in conn.calls[0][1]
+    saved = [call for call in conn.calls if 'schema_meta' in call[1]]
+    assert saved[0][2] == (str(NORMALIZER_VERSION),)
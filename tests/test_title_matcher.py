@@ -0,0 +1,35 @@
+from title_matcher import TitleMatcher, split_year
+from title_normalizer import normalize_title
+
+MOVIES = [
+    {'title': 'Saw', 'release_year': 2004},
+    {'title': 'Saw X', 'release_year': 2023},
+    {'title': 'Halloween', 'release_year': 1978},
+    {'title': 'Halloween', 'release_year': 2018},
+    {'title': 'The Texas Chain Saw Massacre', 'release_year': 1974},
+    {'title': 'Piranha 3D', 'release_year': 2010},
+    {'title': '', 'release_year': 2000},
+]
+
+def test_split_year():
+    assert split_year('Halloween (2018)') == ('Halloween', 2018)
+    assert split_year('Saw X') == ('Saw X', None)
+
+def test_exact_match_uses_title_normalizer_keys():
+    matcher = TitleMatcher(MOVIES)
+    assert len(matcher) == 6
+    assert set(matcher.by_title) == {normalize_title(movie['title']) for movie in MOVIES if movie['title']}
+    assert matcher.match('SAW-X')['release_year'] == 2023
+    assert matcher.match('Piranha 3D')['release_year'] == 2010
+    assert matcher.match('Piranha') is None
+
+def test_year_picks_between_same_titles():
+    matcher = TitleMatcher(MOVIES)
+    assert matcher.match('Halloween (2018)')['release_year'] == 2018
+    assert matcher.match('Halloween', 1979)['release_year'] == 1978
+    assert matcher.match('Halloween', 1990) is None
+
+def test_token_match_requires_enough_coverage():
+    matcher = TitleMatcher(MOVIES)
+    assert matcher.match('Texas Chain Saw Massacre')['release_year'] == 1974
+    assert matcher.match('Chain Saw') is None
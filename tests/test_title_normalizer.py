@@ -0,0 +1,30 @@
+from title_normalizer import clean_title, clean_titles, normalize_title
+
+def test_normalize_title_keeps_format_words_in_stored_titles():
+    assert normalize_title('피라냐 3D') != normalize_title('피라냐')
+    assert normalize_title('죠스 3D') == normalize_title('죠스3D')
+    assert normalize_title('더 플라이 2') != normalize_title('더 플라이')
+
+def test_normalize_title_ignores_case_spacing_and_punctuation():
+    assert normalize_title('Alien: Romulus') == normalize_title('alien romulus')
+    assert normalize_title('ＡＬＩＥＮ') == normalize_title('alien')
+    assert normalize_title('') == ''
+
+def test_clean_title_strips_bracketed_tags():
+    assert clean_title('에이리언: 로물루스 (자막)') == '에이리언: 로물루스'
+    assert clean_title('[IMAX] 듄: 파트2') == '듄: 파트2'
+    assert clean_title('피라냐 (3D/자막)') == '피라냐'
+
+def test_clean_title_strips_only_theater_brand_suffixes():
+    assert clean_title('에이리언: 로물루스 4DX') == '에이리언: 로물루스'
+    assert clean_title('듄: 파트2 IMAX LASER') == '듄: 파트2'
+    assert clean_title('듄: 파트2 SCREEN X / 4DX') == '듄: 파트2'
+    assert clean_title('피라냐 3D') == '피라냐 3D'
+    assert clean_title('아바타 IMAX') == '아바타 IMAX'
+
+def test_scraped_title_matches_stored_title_with_format_word():
+    assert normalize_title(clean_title('피라냐 3D (자막)')) == normalize_title('피라냐 3D')
+    assert normalize_title(clean_title('피라냐 3D')) != normalize_title('피라냐')
+
+def test_clean_titles_dedupes_in_order():
+    assert clean_titles(['듄 (자막)', '듄 (더빙)', '', '에이리언 4DX', '에이리언']) == ['듄', '에이리언']
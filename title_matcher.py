@@ -0,0 +1,99 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from logging_config import get_logger
+from title_normalizer import normalize_title, title_tokens
+
+logger = get_logger(__name__)
+
+YEAR_SUFFIX_PATTERN = re.compile(r'\s*\((\d{4})\)\s*$')
+
+# 부분 일치로 인정할 때 후보 제목에 허용하는 추가 단어 수 (예: 'Saw' -> 'Saw X'는 허용하지 않음)
+MAX_EXTRA_TOKENS = 3
+MIN_TOKEN_COVERAGE = 0.5
+
+def split_year(title: str) -> Tuple[str, Optional[int]]:
+    match = YEAR_SUFFIX_PATTERN.search(title or '')
+    if not match:
+        return title, None
+    return title[:match.start()], int(match.group(1))
+
+# netflix_horror_en 목록으로 한 번 만들어두고 만료 예정 영화마다 조회하는 제목 매처
+# title_normalizer의 비교 키로 해시 맵에서 먼저 찾고, 없으면 단어 역색인으로 모든 단어를 포함하는 후보를 찾는다
+# 후보가 여럿이면 개봉 연도로 구분한다
+class TitleMatcher:
+    def __init__(self, movies: Iterable[Dict[str, Any]]):
+        self.movies: List[Dict[str, Any]] = []
+        self.tokens: List[Tuple[str, ...]] = []
+        self.by_title: Dict[str, List[int]] = {}
+        self.by_token: Dict[str, List[int]] = {}
+
+        for movie in movies:
+            normalized = normalize_title(movie['title'])
+            if not normalized:
+                continue
+            index = len(self.movies)
+            tokens = tuple(title_tokens(movie['title']))
+            self.movies.append(movie)
+            self.tokens.append(tokens)
+            self.by_title.setdefault(normalized, []).append(index)
+            for token in set(tokens):
+                self.by_token.setdefault(token, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def _release_year(self, index: int) -> Optional[int]:
+        release_year = self.movies[index].get('release_year')
+        return int(release_year) if release_year is not None else None
+
+    def _pick_by_year(self, candidates: List[int], year: Optional[int]) -> Optional[int]:
+        if year is None:
+            return candidates[0]
+        for tolerance in (0, 1):
+            for index in candidates:
+                release_year = self._release_year(index)
+                if release_year is not None and abs(release_year - year) <= tolerance:
+                    return index
+        return None
+
+    def _token_candidates(self, tokens: Tuple[str, ...]) -> List[int]:
+        postings = [self.by_token.get(token) for token in set(tokens)]
+        if not all(postings):
+            return []
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+
+        accepted = [
+            index for index in candidates
+            if len(self.tokens[index]) - len(tokens) <= MAX_EXTRA_TOKENS
+            and len(tokens) / len(self.tokens[index]) >= MIN_TOKEN_COVERAGE
+        ]
+        # 추가 단어가 적은 후보부터, 같으면 입력 순서대로
+        return sorted(accepted, key=lambda index: (len(self.tokens[index]), index))
+
+    def match(self, title: str, year: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        title, title_year = split_year(title)
+        year = year or title_year
+        normalized = normalize_title(title)
+        if not normalized:
+            return None
+
+        exact = self.by_title.get(normalized)
+        if exact:
+            index = self._pick_by_year(exact, year)
+            if index is not None:
+                return self.movies[index]
+
+        tokens = tuple(title_tokens(title))
+        # 한 단어짜리 짧은 제목은 부분 일치로 인한 오탐이 많아 정확히 일치할 때만 인정
+        if len(tokens) < 2:
+            return None
+        candidates = self._token_candidates(tokens)
+        if not candidates:
+            return None
+        index = self._pick_by_year(candidates, year)
+        return self.movies[index] if index is not None else None
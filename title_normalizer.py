@@ -0,0 +1,44 @@
+import re
+import unicodedata
+from typing import Iterable, List
+
+# 상영 포맷/자막 표기 등 같은 영화인데 제목에 붙는 꼬리표
+FORMAT_TAGS = [
+    '자막', '더빙', '한글자막', '디지털', '2D', '3D', '4D', '4DX', 'IMAX', 'IMAX LASER',
+    'SCREENX', 'SCREEN X', 'MX4D', 'SUPER 4D', 'DOLBY', 'DOLBY ATMOS', 'ATMOS', 'SOUNDX',
+    'ULTRA 4D'
+]
+_FORMAT_TAG_PATTERN = '|'.join(sorted((re.escape(tag) for tag in FORMAT_TAGS), key=len, reverse=True))
+# 괄호 안 꼬리표: "(자막)", "[IMAX]" 등
+BRACKETED_TAG_PATTERN = re.compile(rf'[\(\[\<]\s*(?:{_FORMAT_TAG_PATTERN})(?:\s*[/,]\s*(?:{_FORMAT_TAG_PATTERN}))*\s*[\)\]\>]', re.IGNORECASE)
+# 괄호 없이 제목 끝에 붙어도 떼는 꼬리표: "에이리언 4DX", "듄 IMAX LASER" 등
+# "피라냐 3D"처럼 2D/3D/4D/IMAX로 끝나는 실제 제목이 있으므로 상영관 브랜드 표기만 뗀다
+TRAILING_FORMAT_TAGS = [
+    '4DX', 'IMAX LASER', 'SCREENX', 'SCREEN X', 'MX4D', 'SUPER 4D', 'ULTRA 4D', 'DOLBY ATMOS', 'SOUNDX'
+]
+_TRAILING_TAG_PATTERN = '|'.join(sorted((re.escape(tag) for tag in TRAILING_FORMAT_TAGS), key=len, reverse=True))
+TRAILING_TAG_PATTERN = re.compile(rf'(?:[\s/,]+(?:{_TRAILING_TAG_PATTERN}))+\s*$', re.IGNORECASE)
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+# normalize_title 규칙을 바꾸면 올린다 (저장된 normalized_title을 모두 다시 계산)
+NORMALIZER_VERSION = 2
+
+# 영화관에서 스크래핑한 제목 정리 (포맷 꼬리표와 중복 공백 제거)
+# TMDB에서 받아 저장하는 제목에는 쓰지 않는다
+def clean_title(title: str) -> str:
+    title = unicodedata.normalize('NFKC', title or '')
+    title = BRACKETED_TAG_PATTERN.sub(' ', title)
+    title = TRAILING_TAG_PATTERN.sub('', title)
+    return ' '.join(title.split())
+
+# 제목 비교용 키 (movie.normalized_title 컬럼에 저장)
+# 대소문자, 공백, 문장부호, 전각/반각 차이만 없애고 꼬리표는 떼지 않는다
+# 스크래핑한 제목은 clean_title을 거친 뒤 이 키로 비교한다
+def normalize_title(title: str) -> str:
+    return ''.join(title_tokens(title))
+
+# normalize_title과 같은 규칙으로 정규화한 단어 목록 (단어 단위 부분 일치용)
+def title_tokens(title: str) -> List[str]:
+    return NON_WORD_PATTERN.sub(' ', unicodedata.normalize('NFKC', title or '').casefold()).split()
+
+def clean_titles(titles: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(title for title in map(clean_title, titles) if title))
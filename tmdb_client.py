@@ -0,0 +1,185 @@
+import asyncio
+import json
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, TypedDict
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+import aiohttp
+from logging_config import get_logger
+from http_cache import HttpCache
+from config import (
+    BASE_URL, THE_MOVIE_DB_URL, TMDB_API_ROOT, HEADERS, MAX_CONCURRENT_REQUESTS,
+    TMDB_RATE_LIMIT, TMDB_RATE_BURST, TMDB_MAX_RETRIES, TMDB_REQUEST_TIMEOUT, HTTP_CACHE_ENABLED
+)
+
+logger = get_logger(__name__)
+
+class TMDBPage(TypedDict):
+    page: int
+    total_pages: int
+    total_results: int
+    results: List[Dict[str, Any]]
+
+class TMDBError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+def update_url_with_params(url: str, params: Dict[str, Any]) -> str:
+    parsed_url = urlparse(url)
+    query_params = dict(parse_qsl(parsed_url.query))
+    query_params.update({key: str(value) for key, value in params.items()})
+    return urlunparse(parsed_url._replace(query=urlencode(query_params)))
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return default
+
+# 초당 rate 개의 토큰이 채워지는 토큰 버킷
+# 429 응답을 받으면 pause()로 Retry-After 동안 모든 요청을 멈춘다
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+# 업데이트 작업들이 함께 쓰는 TMDB API 클라이언트
+# 세션과 커넥터를 재사용해 연결(keep-alive)과 DNS 조회 결과를 공유한다
+class TMDBClient:
+    def __init__(self, rate: float = TMDB_RATE_LIMIT, burst: int = TMDB_RATE_BURST,
+                 max_retries: int = TMDB_MAX_RETRIES, cache: Optional[HttpCache] = None):
+        self.rate_limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.cache = cache
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=MAX_CONCURRENT_REQUESTS * 2,
+                limit_per_host=MAX_CONCURRENT_REQUESTS,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=TMDB_REQUEST_TIMEOUT)
+            )
+        return self._session
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if params:
+            url = update_url_with_params(url, params)
+        session = self._get_session()
+        last_error: Optional[BaseException] = None
+
+        cached = await self.cache.get(url) if self.cache else None
+        request_headers = {}
+        if cached and cached.etag:
+            request_headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            request_headers['If-Modified-Since'] = cached.last_modified
+
+        for attempt in range(1, self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                async with session.get(url, headers=request_headers) as response:
+                    if response.status == 304 and cached:
+                        await self.cache.record_hit(url)
+                        return json.loads(cached.body)
+                    if response.status == 429:
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        logger.warning(f"TMDB 요청 제한 (429). {retry_after:.1f}초 후 재시도 (시도 {attempt}/{self.max_retries})")
+                        self.rate_limiter.pause(retry_after)
+                        last_error = TMDBError(f"429 Too Many Requests: {url}")
+                        continue
+                    if response.status >= 500:
+                        last_error = TMDBError(f"HTTP {response.status}: {url}")
+                    else:
+                        if response.status != 200:
+                            raise TMDBError(f"HTTP {response.status}: {url}", response.status)
+                        body = await response.read()
+                        if self.cache:
+                            self.cache.record_miss()
+                            await self.cache.put(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), body)
+                        return json.loads(body)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+
+            delay = min(2 ** (attempt - 1), 10)
+            logger.warning(f"TMDB 요청 실패: {last_error}. {delay}초 후 재시도 (시도 {attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+        raise TMDBError(f"TMDB 요청 재시도 횟수 초과: {url}") from last_error
+
+    async def discover(self, params: Dict[str, Any], page: int = 1) -> TMDBPage:
+        return await self.get_json(BASE_URL, {**params, 'page': page})
+
+    async def upcoming(self, page: int = 1) -> TMDBPage:
+        return await self.get_json(THE_MOVIE_DB_URL, {'page': page})
+
+    async def details(self, movie_id: int, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.get_json(f"{TMDB_API_ROOT}/movie/{movie_id}", params)
+
+    async def changes(self, start_date: str, end_date: str, page: int = 1) -> TMDBPage:
+        return await self.get_json(f"{TMDB_API_ROOT}/movie/changes", {
+            'start_date': start_date,
+            'end_date': end_date,
+            'page': page
+        })
+
+    async def watch_providers(self, movie_id: int) -> Dict[str, Any]:
+        return await self.get_json(f"{TMDB_API_ROOT}/movie/{movie_id}/watch/providers")
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self.cache:
+            stats = self.cache.stats()
+            logger.info(f"TMDB 응답 캐시: 적중 {stats['hits']}회, 실패 {stats['misses']}회, 제거 {stats['evictions']}회 (적중률 {stats['hit_rate']:.0%})")
+            self.cache.close()
+            self.cache = None
+
+tmdb_client: Optional[TMDBClient] = None
+
+def get_tmdb_client() -> TMDBClient:
+    global tmdb_client
+    if not tmdb_client:
+        tmdb_client = TMDBClient(cache=HttpCache() if HTTP_CACHE_ENABLED else None)
+    return tmdb_client
+
+async def close_tmdb_client() -> None:
+    global tmdb_client
+    if tmdb_client:
+        await tmdb_client.close()
+        tmdb_client = None
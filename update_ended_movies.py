@@ -1,69 +1,84 @@
 import asyncio
 import time
-from typing import List
+from typing import Dict, List, Sequence
 from logging_config import get_logger
-from database import get_db_pool, execute_query, execute_many
+from database import execute_query, execute_many
+from title_normalizer import normalize_title
+from schema import is_trgm_enabled
+from config import TITLE_TRGM_THRESHOLD
 
 logger = get_logger(__name__)
 
+# 유사 제목으로 상영 정보를 추가했다면 종료 판정도 같은 기준을 써야 다음 실행에서 지워지지 않는다
+SIMILAR_TITLE_CONDITION = "OR similarity(scraped.normalized_title, m.normalized_title) >= $3"
+
 MAX_DB_CONNECTIONS = 5
 db_semaphore = asyncio.Semaphore(MAX_DB_CONNECTIONS)
 
-async def update_ended(cgv_movie_names: List[str], lotte_movie_names: List[str]) -> None:
+async def update_ended(pool, cgv_movie_names: List[str], lotte_movie_names: List[str],
+                       incomplete_theaters: Sequence[str] = ()) -> None:
     start_time = time.time()
     logger.info("상영 종료 영화 업데이트 시작")
     
     try:
-        pool = await get_db_pool()
         async with pool.acquire() as conn:
-            movie_info = await conn.fetch("SELECT id, title FROM movie")
-            
-            cgv_ended_movies = [i['id'] for i in movie_info if i['title'] not in cgv_movie_names]
-            lotte_ended_movies = [i['id'] for i in movie_info if i['title'] not in lotte_movie_names]
-
-            theater_ids = {
-                'CGV': await find_theater_id(conn, 'CGV'),
-                '롯데시네마': await find_theater_id(conn, '롯데시네마')
-            }
+            theater_ids = await find_theater_ids(conn, ['CGV', '롯데시네마'])
 
-            for theater_name, ended_movies in [
-                ('CGV', cgv_ended_movies),
-                ('롯데시네마', lotte_ended_movies)
+            for theater_name, movie_names in [
+                ('CGV', cgv_movie_names),
+                ('롯데시네마', lotte_movie_names)
             ]:
-                theater_id = theater_ids[theater_name]
-                if theater_id and ended_movies:
-                    if await find_movie_theater_info(conn, ended_movies, theater_id):
-                        await delete_ended_movie_theater_info(conn, ended_movies, theater_id)
-                        logger.info("영화 상영 정보 삭제 완료", extra={"theater": theater_name, "deleted_count": len(ended_movies)})
-                else:
-                    logger.warning("영화관 정보 없음 또는 종료된 영화 없음", extra={"theater": theater_name})
+                theater_id = theater_ids.get(theater_name)
+                if theater_id is None:
+                    logger.warning("영화관 정보 없음", extra={"theater": theater_name})
+                    continue
+                # 목록 중 하나라도 가져오지 못했으면 빠진 목록의 영화가 상영 종료로 지워지므로 건너뛴다
+                if theater_name in incomplete_theaters:
+                    logger.warning("일부 목록만 스크래핑됨. 상영 종료 처리를 건너뜁니다.", extra={"theater": theater_name})
+                    continue
+                # 스크래핑이 실패해 목록이 비어 있으면 모든 상영 정보가 지워지므로 건너뛴다
+                if not movie_names:
+                    logger.warning("스크래핑된 영화 없음. 상영 종료 처리를 건너뜁니다.", extra={"theater": theater_name})
+                    continue
+
+                deleted_movie_ids = await delete_ended_movie_theater_info(conn, movie_names, theater_id)
+                logger.info("영화 상영 정보 삭제 완료", extra={"theater": theater_name, "deleted_count": len(deleted_movie_ids)})
 
     except Exception as e:
         logger.exception("상영 종료 영화 업데이트 중 오류 발생")
+        raise
     
     end_time = time.time()
     logger.info("상영 종료 영화 업데이트 완료", extra={"execution_time": f"{end_time - start_time:.2f}초"})
 
-async def delete_ended_movie_theater_info(conn, movie_ids: List[int], theater_id: int) -> None:
+async def delete_ended_movie_theater_info(conn, movie_names: List[str], theater_id: int) -> List[int]:
+    # 스크래핑한 제목 목록을 한 번만 보내고, 목록에 없는 영화의 상영 정보를 서버에서 anti-join으로 찾아 한 번에 삭제
     async with db_semaphore:
-        query = """
-        DELETE FROM movie_theaters
-        WHERE movie_id = $1 AND theaters_id = $2
+        similar_condition = SIMILAR_TITLE_CONDITION if is_trgm_enabled() else ''
+        query = f"""
+        DELETE FROM movie_theaters mt
+        USING movie m
+        WHERE mt.theaters_id = $2
+          AND mt.movie_id = m.id
+          AND NOT EXISTS (
+              SELECT 1
+              FROM unnest($1::text[]) AS scraped(normalized_title)
+              WHERE scraped.normalized_title = m.normalized_title
+              {similar_condition}
+          )
+        RETURNING mt.movie_id
         """
+        args = [list({normalize_title(name) for name in movie_names} - {''}), theater_id]
+        if is_trgm_enabled():
+            args.append(TITLE_TRGM_THRESHOLD)
         try:
-            await conn.executemany(query, [(movie_id, theater_id) for movie_id in movie_ids])
+            result = await conn.fetch(query, *args)
+            return [row['movie_id'] for row in result]
         except Exception as e:
-            logger.error("영화 상영 정보 삭제 중 오류 발생", extra={"error": str(e), "movie_ids": movie_ids, "theater_id": theater_id})
+            logger.error("영화 상영 정보 삭제 중 오류 발생", extra={"error": str(e), "theater_id": theater_id})
             raise
 
-async def find_theater_id(conn, movie_theater_name: str) -> int:
-    query = "SELECT id FROM theaters WHERE name = $1"
-    result = await conn.fetchrow(query, movie_theater_name)
-    return result['id'] if result else None
-
-async def find_movie_theater_info(conn, movie_ids: List[int], theater_id: int) -> List[dict]:
-    query = """
-    SELECT id FROM movie_theaters
-    WHERE movie_id = ANY($1) AND theaters_id = $2
-    """
-    return await conn.fetch(query, movie_ids, theater_id) # 실제 사용 시 영화 이름 리스트를 넣어주세요
\ No newline at end of file
+async def find_theater_ids(conn, movie_theater_names: List[str]) -> Dict[str, int]:
+    query = "SELECT id, name FROM theaters WHERE name = ANY($1)"
+    result = await conn.fetch(query, movie_theater_names)
+    return {row['name']: row['id'] for row in result}
@@ -1,139 +1,71 @@
 import asyncio
-import aiohttp
-import traceback
 import time
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from logging_config import setup_logging, get_logger
-from database import get_db_pool, execute_many, batch_insert
+from database import bulk_merge
+from title_normalizer import normalize_title
+from content_hash import movie_content_hash
 from config import (
-    BASE_URL, HORROR_GENRE_ID, PROVIDER_MAPPING, HEADERS
+    HORROR_GENRE_ID, PROVIDER_MAPPING, PROVIDER_SYNC_MODE, PROVIDER_FULL_SYNC_DAYS,
+    TMDB_CHANGES_MAX_DAYS, WATCH_REGION, PIPELINE_BATCH_SIZE, PIPELINE_QUEUE_SIZE
 )
-from aiocache import cached, Cache
-from aiocache.serializers import PickleSerializer
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
-from contextlib import asynccontextmanager
-from datetime import datetime
-import asyncpg
+from tmdb_client import TMDBClient, TMDBError, get_tmdb_client
+from checkpoint import CheckpointStore
+from datetime import date, datetime, timedelta, timezone
 
 # 스크립트 시작 시 로깅 설정 초기화
 setup_logging()
 logger = get_logger(__name__)
 
-MAX_DB_CONNECTIONS = 5
-db_semaphore = asyncio.Semaphore(MAX_DB_CONNECTIONS)
+MOVIE_COLUMNS = [
+    'the_movie_db_id', 'title', 'release_date', 'overview', 'poster_path', 'is_theatrical_release', 'normalized_title',
+    'content_hash'
+]
 
-def create_url_with_params(base_url: str, params: Dict[str, Any]) -> str:
-    return f"{base_url}?{urlencode(params)}"
+def movie_record(movie: Dict[str, Any]) -> Tuple:
+    return (
+        int(movie['the_movie_db_id']), movie['title'], movie['release_date'], movie['overview'],
+        movie['poster_path'], movie['is_theatrical_release'], normalize_title(movie['title']), movie_content_hash(movie)
+    )
 
-def update_url_with_page(url: str, page: int) -> str:
-    parsed_url = urlparse(url)
-    query_params = dict(parse_qsl(parsed_url.query))
-    query_params['page'] = str(page)
-    new_query = urlencode(query_params)
-    return urlunparse(parsed_url._replace(query=new_query))
+# 내용 해시가 같은 행은 건너뛰어 매주 실행해도 바뀐 영화만 새 튜플/WAL을 쓴다
+MOVIE_CHANGED_CONDITION = 'movie.content_hash IS DISTINCT FROM EXCLUDED.content_hash'
 
-@asynccontextmanager
-async def get_db_connection():
-    pool = await get_db_pool()
-    try:
-        yield pool
-    finally:
-        await pool.close()
-
-async def upsert_movies(conn, movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    async with db_semaphore:
-        temp_table_name = 'temp_movies'
-        
-        movie_data = [
-            (int(movie['the_movie_db_id']), movie['title'], movie['release_date'], movie['overview'], movie['poster_path'], movie['is_theatrical_release'])
-            for movie in movies
-        ]
-        
-        try:
-            async with conn.transaction():
-                # 임시 테이블이 존재하면 삭제
-                await conn.execute(f'DROP TABLE IF EXISTS {temp_table_name}')
-                
-                # 임시 테이블 생성
-                await conn.execute(f'''
-                    CREATE TEMP TABLE {temp_table_name} (
-                        the_movie_db_id INTEGER PRIMARY KEY,
-                        title TEXT,
-                        release_date DATE,
-                        overview TEXT,
-                        poster_path TEXT,
-                        is_theatrical_release BOOLEAN
-                    )
-                ''')
-                
-                # 임시 테이블에 데이터 삽입
-                await conn.copy_records_to_table(temp_table_name, records=movie_data)
-                
-                # 실제 테이블에 upsert 수행
-                result = await conn.fetch(f'''
-                    INSERT INTO movie (the_movie_db_id, title, release_date, overview, poster_path, is_theatrical_release)
-                    SELECT * FROM {temp_table_name}
-                    ON CONFLICT (the_movie_db_id) DO UPDATE
-                    SET title = EXCLUDED.title,
-                        release_date = EXCLUDED.release_date,
-                        overview = EXCLUDED.overview,
-                        poster_path = EXCLUDED.poster_path,
-                        is_theatrical_release = EXCLUDED.is_theatrical_release
-                    RETURNING id, the_movie_db_id, title
-                ''')
-                
-                # 임시 테이블 삭제
-                await conn.execute(f'DROP TABLE IF EXISTS {temp_table_name}')
-                
-                logger.info(f"{len(result)}개의 영화 업서트 완료")
-                return [dict(row) for row in result]
-                
-        except Exception as e:
-            logger.error(f"영화 업서트 중 오류 발생: {e}")
-            # 오류 발생 시에도 임시 테이블 삭제 시도
-            try:
-                await conn.execute(f'DROP TABLE IF EXISTS {temp_table_name}')
-            except Exception:
-                pass
-            raise
+async def merge_movie_records(conn, records) -> Dict[str, int]:
+    result = await bulk_merge(
+        conn, 'movie', MOVIE_COLUMNS, records,
+        conflict_keys=['the_movie_db_id'],
+        update_columns=MOVIE_COLUMNS[1:],
+        update_where=MOVIE_CHANGED_CONDITION,
+        chunk_size=PIPELINE_BATCH_SIZE
+    )
+    counts = {key: result[key] for key in ('inserted', 'updated', 'unchanged')}
+    logger.info(f"영화 업서트 완료: 추가 {counts['inserted']}개, 수정 {counts['updated']}개, 변경 없음 {counts['unchanged']}개")
+    return counts
 
-async def get_discover_movie_all_pages(session: aiohttp.ClientSession, url: str, headers: Dict[str, str]) -> List[Dict[str, Any]]:
-    logger.info(f"요청 헤더: {headers}")
-    async def fetch_page(page: int) -> Dict[str, Any]:
-        new_url = update_url_with_page(url, page)
-        async with session.get(new_url, headers=headers) as response:
-            if response.status != 200:
-                logger.error(f"URL에 대한 HTTP 오류 {response.status}: {new_url}")
-                return {}
-            data = await response.json()
-            logger.info(f"페이지 {page} 조회 완료, {len(data.get('results', []))}개의 결과")
-            return data
-
-    current_page, total_pages, upcoming_movies = await get_first_page_discover_movie(session, url, headers)
+async def iter_discover_pages(client: TMDBClient, params: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+    # 페이지가 도착하는 대로 매핑해서 넘기고, 동시에 조회하는 페이지 수는 PIPELINE_QUEUE_SIZE로 제한
+    first_page = await client.discover(params, 1)
+    total_pages = first_page.get('total_pages', 0)
     logger.info(f"전체 페이지 수: {total_pages}")
-    
-    if total_pages > 1:
-        tasks = [fetch_page(page) for page in range(current_page + 1, total_pages + 1)]
-        responses = await asyncio.gather(*tasks)
-        
-        for response in responses:
-            if response:  # 빈 딕셔너리가 아닌 경우에만 처리
-                upcoming_movies.extend(map_discover_movie_data(response.get('results', [])))
-    
-    logger.info(f"전체 조회된 영화 수: {len(upcoming_movies)}")
-    return upcoming_movies
-
-async def get_first_page_discover_movie(session: aiohttp.ClientSession, url: str, headers: Dict[str, str]) -> Tuple[int, int, List[Dict[str, Any]]]:
-    async with session.get(url, headers=headers) as response:
-        data = await response.json()
-        logger.info(f"API 응답: {data}")
-        logger.debug(f"첫 번째 영화 결과: {data.get('results', [])[0] if data.get('results') else '결과 없음'}")
-        current_page = data.get('page', 0)
-        total_pages = data.get('total_pages', 0)
-        results = data.get('results', [])
-        upcoming_movies = map_discover_movie_data(results)
-        logger.info(f"첫 페이지에서 {len(upcoming_movies)}개의 영화 파싱 완료")
-        return current_page, total_pages, upcoming_movies
+    yield map_discover_movie_data(first_page.get('results', []))
+
+    next_pages = iter(range(2, total_pages + 1))
+    pending = set()
+    try:
+        while True:
+            for page in next_pages:
+                pending.add(asyncio.create_task(client.discover(params, page)))
+                if len(pending) >= PIPELINE_QUEUE_SIZE:
+                    break
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield map_discover_movie_data(task.result().get('results', []))
+    finally:
+        for task in pending:
+            task.cancel()
 
 def map_discover_movie_data(upcoming_movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     horrors = []
@@ -156,155 +88,330 @@ def map_discover_movie_data(upcoming_movies: List[Dict[str, Any]]) -> List[Dict[
     logger.info(f"Filtered {len(horrors)} horror movies from {len(upcoming_movies)} total movies")
     return horrors
 
-@cached(ttl=3600, cache=Cache.MEMORY, serializer=PickleSerializer())
-async def get_movies_for_provider(session: aiohttp.ClientSession, provider_id: int) -> List[Dict[str, Any]]:
-    params = {
+def discover_params(provider_id: int) -> Dict[str, Any]:
+    return {
         'include_adult': 'false',
         'include_video': 'false',
         'language': 'ko-KR',
-        'page': 1,
         'sort_by': 'popularity.desc',
-        'watch_region': 'KR',
+        'watch_region': WATCH_REGION,
         'with_genres': str(HORROR_GENRE_ID),
         'with_watch_providers': str(provider_id)
     }
-    url = create_url_with_params(BASE_URL, params)
-    logger.info(f"Fetching movies for provider ID {provider_id} with URL: {url}")
+
+# 공급자 조회 결과는 PIPELINE_BATCH_SIZE 단위 배치로 나눠 저장하고,
+# 조회가 끝나면 배치 수와 run_id를 담은 완료 표시를 provider_stage에 저장한다
+def provider_stage(provider_id: int) -> str:
+    return f"provider:{provider_id}"
+
+def provider_batch_stage(provider_id: int, index: int) -> str:
+    return f"{provider_stage(provider_id)}:{index}"
+
+def checkpoint_movie(movie: Dict[str, Any]) -> Dict[str, Any]:
+    release_date = movie['release_date']
+    return {**movie, 'release_date': release_date.isoformat() if release_date else None}
+
+def restore_movie(movie: Dict[str, Any]) -> Dict[str, Any]:
+    release_date = movie['release_date']
+    return {**movie, 'release_date': date.fromisoformat(release_date) if release_date else None}
+
+async def produce_provider_movies(client: TMDBClient, provider_id: int, queue: asyncio.Queue,
+                                  checkpoints: Optional[CheckpointStore] = None) -> bool:
+    start_time = time.time()
+    mapped_provider_id = PROVIDER_MAPPING[provider_id]
+
+    # 이전 실행에서 조회를 마친 공급자는 TMDB를 다시 조회하지 않고 저장된 배치를 하나씩 읽어 넘긴다
+    completed = await checkpoints.load(provider_stage(provider_id)) if checkpoints else None
+    if completed is not None:
+        count = 0
+        for index in range(completed['batches']):
+            saved_movies = await checkpoints.load(provider_batch_stage(provider_id, index), completed['run_id'])
+            if saved_movies is None:
+                # 이미 넘긴 배치는 병합돼도 되지만, 빠진 배치가 있으므로 이 공급자의 관계는 정리하지 않는다
+                logger.error(f"공급자 ID {provider_id} 체크포인트 배치 {index}가 없습니다.")
+                return False
+            await queue.put((mapped_provider_id, [restore_movie(movie) for movie in saved_movies]))
+            count += len(saved_movies)
+        logger.info(f"공급자 ID {provider_id} 체크포인트 사용: {count}개")
+        return True
+
+    count = 0
+    batches = 0
+    batch: List[Dict[str, Any]] = []
     try:
-        movies = await get_discover_movie_all_pages(session, url, HEADERS)
-        logger.info(f"Retrieved {len(movies)} movies for provider ID {provider_id}")
-        return movies
+        async for movies in iter_discover_pages(client, discover_params(provider_id)):
+            await queue.put((mapped_provider_id, movies))
+            count += len(movies)
+            if not checkpoints:
+                continue
+            batch += [checkpoint_movie(movie) for movie in movies]
+            if len(batch) >= PIPELINE_BATCH_SIZE:
+                await checkpoints.save(provider_batch_stage(provider_id, batches), batch)
+                batches += 1
+                batch = []
+        if checkpoints:
+            if batch:
+                await checkpoints.save(provider_batch_stage(provider_id, batches), batch)
+                batches += 1
+            await checkpoints.save(provider_stage(provider_id), {'batches': batches, 'run_id': checkpoints.run_id})
     except Exception as e:
-        logger.error(f"Error fetching movies for provider ID {provider_id}: {e}")
-        return []
+        logger.error(f"공급자 ID {provider_id} 처리 중 오류 발생: {e}")
+        return False
+    logger.info(f"공급자 ID {provider_id} 조회 완료: {count}개 (소요 시간: {time.time() - start_time:.2f}초)")
+    return True
+
+async def consume_provider_movies(conn, queue: asyncio.Queue) -> AsyncIterator[Tuple]:
+    # 큐에서 받은 페이지를 영화 행으로 넘기고, 영화-공급자 관계는 PIPELINE_BATCH_SIZE 단위로 임시 테이블에 COPY
+    # bulk_merge가 같은 연결로 청크를 병합하는 동안에는 다음 항목을 꺼내지 않으므로 연결을 동시에 쓰지 않는다
+    # 여러 공급자에 있는 영화는 처음 한 번만 넘겨서 병합 수가 서로 다른 영화 수가 되게 한다 (관계는 모두 기록)
+    relation_records: List[Tuple[int, int]] = []
+    seen_movie_ids = set()
+    while True:
+        item = await queue.get()
+        if item is None:
+            break
+        mapped_provider_id, movies = item
+        for movie in movies:
+            if movie['the_movie_db_id'] in seen_movie_ids:
+                continue
+            seen_movie_ids.add(movie['the_movie_db_id'])
+            yield movie_record(movie)
+        relation_records += [(movie['the_movie_db_id'], mapped_provider_id) for movie in movies]
+        if len(relation_records) >= PIPELINE_BATCH_SIZE:
+            await conn.copy_records_to_table('current_movie_providers', records=relation_records)
+            relation_records = []
+    if relation_records:
+        await conn.copy_records_to_table('current_movie_providers', records=relation_records)
+
+async def reconcile_movie_providers(conn, synced_provider_ids: List[int]) -> None:
+    # 조회에 성공한 공급자에 대해서만 더 이상 제공되지 않는 영화-공급자 관계 삭제
+    delete_result = await conn.execute('''
+        DELETE FROM movie_providers mp
+        WHERE mp.the_provider_id = ANY($1::int[])
+          AND NOT EXISTS (
+              SELECT 1
+              FROM current_movie_providers cmp
+              JOIN movie m ON m.the_movie_db_id = cmp.the_movie_db_id
+              WHERE m.id = mp.movie_id
+                AND cmp.the_provider_id = mp.the_provider_id
+          )
+    ''', synced_provider_ids)
+    logger.info(f"더 이상 제공되지 않는 영화-공급자 관계 삭제 완료: {delete_result}")
+
+    insert_result = await conn.execute('''
+        INSERT INTO movie_providers (movie_id, the_provider_id)
+        SELECT DISTINCT m.id, cmp.the_provider_id
+        FROM current_movie_providers cmp
+        JOIN movie m ON m.the_movie_db_id = cmp.the_movie_db_id
+        ON CONFLICT (movie_id, the_provider_id) DO NOTHING
+    ''')
+    logger.info(f"새로운 영화-공급자 관계 추가 완료: {insert_result}")
+
+async def load_provider_sync_state(conn) -> Dict[int, Dict[str, Any]]:
+    rows = await conn.fetch("SELECT provider_id, high_water_mark, last_full_sync_at FROM provider_sync_state")
+    return {row['provider_id']: dict(row) for row in rows}
+
+async def save_provider_sync_state(conn, provider_ids: List[int], synced_at: datetime, full_sync: bool) -> None:
+    await conn.execute('''
+        INSERT INTO provider_sync_state (provider_id, high_water_mark, last_full_sync_at)
+        SELECT provider_id, $2, CASE WHEN $3 THEN $2 END
+        FROM unnest($1::int[]) AS p(provider_id)
+        ON CONFLICT (provider_id) DO UPDATE
+        SET high_water_mark = EXCLUDED.high_water_mark,
+            last_full_sync_at = COALESCE(EXCLUDED.last_full_sync_at, provider_sync_state.last_full_sync_at)
+    ''', provider_ids, synced_at, full_sync)
+
+def needs_full_sync(sync_state: Dict[int, Dict[str, Any]], now: datetime) -> bool:
+    if PROVIDER_SYNC_MODE == 'full':
+        return True
+    for mapped_provider_id in PROVIDER_MAPPING.values():
+        state = sync_state.get(mapped_provider_id)
+        if not state or not state['last_full_sync_at']:
+            return True
+        if now - state['last_full_sync_at'] >= timedelta(days=PROVIDER_FULL_SYNC_DAYS):
+            return True
+        # 변경 피드는 최근 14일까지만 조회할 수 있으므로 그보다 오래됐으면 전체 동기화
+        if now - state['high_water_mark'] >= timedelta(days=TMDB_CHANGES_MAX_DAYS):
+            return True
+    return False
+
+async def fetch_changed_movie_ids(client: TMDBClient, since: datetime, until: datetime) -> List[int]:
+    start_date, end_date = since.date().isoformat(), until.date().isoformat()
+    first_page = await client.changes(start_date, end_date, 1)
+    pages = [first_page]
+    total_pages = first_page.get('total_pages', 1)
+    if total_pages > 1:
+        pages += await asyncio.gather(*[
+            client.changes(start_date, end_date, page) for page in range(2, total_pages + 1)
+        ])
+    return list({result['id'] for page in pages for result in page.get('results', [])})
+
+def map_watch_providers(data: Dict[str, Any]) -> List[int]:
+    region = data.get('results', {}).get(WATCH_REGION, {})
+    provider_ids = {
+        provider['provider_id']
+        for offers in region.values() if isinstance(offers, list)
+        for provider in offers
+    }
+    return sorted(PROVIDER_MAPPING[provider_id] for provider_id in provider_ids if provider_id in PROVIDER_MAPPING)
 
-async def insert_movies_with_provider(pool, movies: List[Dict[str, Any]], provider_id: int) -> None:
-    mapped_provider_id = PROVIDER_MAPPING.get(provider_id)
-    if not mapped_provider_id:
-        logger.error(f"알 수 없는 공급자 ID: {provider_id}")
-        return
-    
-    logger.info(f"공급자 ID {provider_id} (매핑된 ID: {mapped_provider_id})의 영화 {len(movies)}개를 처리 중입니다.")
+# 저장되지 않은 영화는 상세 정보와 공급자 정보를 한 번에 조회한다
+NEW_MOVIE_DETAILS_PARAMS = {'language': 'ko-KR', 'append_to_response': 'watch/providers'}
 
+# 변경 피드에는 삭제된 영화도 있어 404는 건너뛴다
+async def fetch_movie_with_providers(client: TMDBClient, movie_id: int) -> Optional[Dict[str, Any]]:
     try:
-        async with pool.acquire() as conn:
-            async with conn.transaction():
-                start_time = time.time()
-                inserted_movies = await upsert_movies(conn, movies)
-                upsert_time = time.time() - start_time
-                logger.info(f"영화 업서트 완료. 소요 시간: {upsert_time:.2f}초")
-                
-                if inserted_movies:
-                    movie_provider_data = [
-                        (movie['id'], mapped_provider_id)
-                        for movie in inserted_movies
-                    ]
-                    
-                    start_time = time.time()
-                    await upsert_movie_providers(conn, movie_provider_data)
-                    insert_time = time.time() - start_time
-                    logger.info(f"공급자 정보 업서트 완료. 소요 시간: {insert_time:.2f}초")
-                    
-                    logger.info(f"트랜잭션 커밋 완료")
-                else:
-                    logger.warning(f"공급자 ID {provider_id}에 대해 삽입된 영화가 없습니다.")
-    except asyncpg.exceptions.PostgresError as e:
-        logger.error(f"데이터베이스 오류 발생: {e}")
-    except Exception as e:
-        logger.error(f"예상치 못한 오류 발생: {e}")
-        logger.error(traceback.format_exc())
-    
-    logger.info(f"공급자 ID {provider_id} (매핑된 ID: {mapped_provider_id})의 영화 {len(movies)}개 처리가 완료되었습니다.")
-
-async def upsert_movie_providers(conn, movie_provider_data: List[Tuple[int, int]]) -> None:
-    async with conn.transaction():
-        await conn.execute('''
-            CREATE TEMP TABLE temp_movie_providers (
-                movie_id INTEGER,
-                the_provider_id INTEGER
-            ) ON COMMIT DROP
-        ''')
-        
-        await conn.copy_records_to_table('temp_movie_providers', records=movie_provider_data)
-        
-        await conn.execute('''
-            INSERT INTO movie_providers (movie_id, the_provider_id)
-            SELECT movie_id, the_provider_id FROM temp_movie_providers
-            ON CONFLICT (movie_id, the_provider_id) DO NOTHING
-        ''')
-
-async def update_all_providers() -> None:
-    logger.info("영화 공급자 정보 업데이트 시작")
-    start_time = time.time()
-    
-    async with aiohttp.ClientSession() as session, get_db_connection() as pool:
-        async with pool.acquire() as conn:
-            # 현재 공급자-영화 관계를 저장할 임시 테이블 생성
+        return await client.details(movie_id, NEW_MOVIE_DETAILS_PARAMS)
+    except TMDBError as e:
+        if e.status == 404:
+            return None
+        raise
+
+# 전체 동기화의 discover 조건과 같게 성인물이 아니고 공포 장르이며 매핑된 공급자가 있는 영화만 추가한다
+def is_new_provider_movie(details: Optional[Dict[str, Any]]) -> bool:
+    if not details or details.get('adult'):
+        return False
+    if not any(str(genre.get('id')) == str(HORROR_GENRE_ID) for genre in details.get('genres', [])):
+        return False
+    return bool(map_watch_providers(details.get('watch/providers', {})))
+
+async def full_sync_providers(pool, client: TMDBClient, synced_at: datetime,
+                              checkpoints: Optional[CheckpointStore] = None) -> None:
+    # 공급자별 조회는 동시에 실행하고, 도착한 페이지는 배치 단위로 바로 병합해서 네트워크와 DB 작업을 겹친다
+    # 큐 크기로 조회 속도를 DB 쓰기 속도에 맞추고 체크포인트도 배치 단위로 저장해서 메모리 사용량을 배치 크기 수준으로 유지한다
+    provider_ids = list(PROVIDER_MAPPING.keys())
+    queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    async def produce_all() -> List[bool]:
+        cancelled = False
+        try:
+            return await asyncio.gather(*[
+                produce_provider_movies(client, provider_id, queue, checkpoints) for provider_id in provider_ids
+            ])
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # 소비자가 실패해서 취소된 경우 큐를 비울 쪽이 없어 가득 찬 큐에 넣으면 멈추므로 종료 표시를 넣지 않는다
+            if not cancelled:
+                await queue.put(None)
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
             await conn.execute('''
-                DROP TABLE IF EXISTS current_movie_providers;
                 CREATE TEMP TABLE current_movie_providers (
-                    movie_id INTEGER,
+                    the_movie_db_id INTEGER,
                     the_provider_id INTEGER
-                )
+                ) ON COMMIT DROP
             ''')
-            
-            # 각 공급자별로 현재 제공 중인 영화 정보 수집
-            for provider_id in PROVIDER_MAPPING.keys():
-                try:
-                    # 각 공급자마다 새로운 트랜잭션 사용
-                    async with conn.transaction():
-                        movies = await get_movies_for_provider(session, provider_id)
-                        if movies:
-                            inserted_movies = await upsert_movies(conn, movies)
-                            mapped_provider_id = PROVIDER_MAPPING[provider_id]
-                            
-                            movie_provider_data = [
-                                (movie['id'], mapped_provider_id)
-                                for movie in inserted_movies
-                            ]
-                            
-                            await conn.copy_records_to_table(
-                                'current_movie_providers', 
-                                records=movie_provider_data
-                            )
-                            logger.info(f"공급자 ID {provider_id}의 {len(movie_provider_data)}개 영화 관계 정보 추가 완료")
-                            
-                except Exception as e:
-                    logger.error(f"공급자 ID {provider_id} 처리 중 오류 발생: {e}")
-                    continue
-            
+
+            producer = asyncio.create_task(produce_all())
             try:
-                # 최종 업데이트는 별도 트랜잭션으로 처리
-                async with conn.transaction():
-                    # 더 이상 제공되지 않는 영화-공급자 관계 삭제
-                    delete_result = await conn.execute('''
-                        WITH to_delete AS (
-                            SELECT mp.movie_id, mp.the_provider_id
-                            FROM movie_providers mp
-                            LEFT JOIN current_movie_providers cmp 
-                                ON mp.movie_id = cmp.movie_id 
-                                AND mp.the_provider_id = cmp.the_provider_id
-                            WHERE cmp.movie_id IS NULL
-                        )
-                        DELETE FROM movie_providers mp
-                        USING to_delete td
-                        WHERE mp.movie_id = td.movie_id 
-                        AND mp.the_provider_id = td.the_provider_id
-                    ''')
-                    logger.info(f"더 이상 제공되지 않는 {delete_result} 개의 영화-공급자 관계 삭제 완료")
-                    
-                    # 새로운 영화-공급자 관계 추가
-                    insert_result = await conn.execute('''
-                        INSERT INTO movie_providers (movie_id, the_provider_id)
-                        SELECT DISTINCT cmp.movie_id, cmp.the_provider_id 
-                        FROM current_movie_providers cmp
-                        ON CONFLICT (movie_id, the_provider_id) DO NOTHING
-                    ''')
-                    logger.info(f"새로운 영화-공급자 관계 {insert_result} 개 추가 완료")
-            
-            finally:
-                # 임시 테이블 정리
-                await conn.execute('DROP TABLE IF EXISTS current_movie_providers')
-    
+                counts = await merge_movie_records(conn, consume_provider_movies(conn, queue))
+            except BaseException:
+                producer.cancel()
+                await asyncio.gather(producer, return_exceptions=True)
+                raise
+            results = await producer
+
+            synced_provider_ids = [
+                PROVIDER_MAPPING[provider_id] for provider_id, ok in zip(provider_ids, results) if ok
+            ]
+            if not synced_provider_ids:
+                raise RuntimeError("조회에 성공한 공급자가 없습니다.")
+            logger.info(f"{len(synced_provider_ids)}개 공급자 조회 완료, 영화 {sum(counts.values())}개 병합")
+
+            await reconcile_movie_providers(conn, synced_provider_ids)
+            await save_provider_sync_state(conn, synced_provider_ids, synced_at, full_sync=True)
+
+    # 커밋까지 끝난 공급자의 체크포인트는 더 이상 필요 없다
+    if checkpoints:
+        await checkpoints.clear([
+            provider_stage(provider_id) for provider_id, ok in zip(provider_ids, results) if ok
+        ])
+    # 성공한 공급자는 반영하고, 작업은 실패로 기록해서 JOB_RETRY_DELAY 뒤에 나머지를 다시 조회한다
+    failed_provider_ids = [provider_id for provider_id, ok in zip(provider_ids, results) if not ok]
+    if failed_provider_ids:
+        raise RuntimeError(f"공급자 조회 실패: {', '.join(map(str, failed_provider_ids))}")
+
+async def incremental_sync_providers(pool, client: TMDBClient, sync_state: Dict[int, Dict[str, Any]],
+                                     synced_at: datetime) -> None:
+    since = min(state['high_water_mark'] for state in sync_state.values())
+    changed_ids = await fetch_changed_movie_ids(client, since, synced_at)
+
+    async with pool.acquire() as conn:
+        # 변경된 영화 중 이미 저장된 영화는 공급자 정보만 다시 조회
+        known_movies = await conn.fetch(
+            "SELECT id, the_movie_db_id FROM movie WHERE the_movie_db_id = ANY($1::int[])", changed_ids
+        )
+    logger.info(f"변경 피드 {len(changed_ids)}개 중 저장된 영화 {len(known_movies)}개의 공급자 정보 재조회")
+
+    # 저장되지 않은 영화 중 새 공포 영화는 다음 전체 동기화를 기다리지 않고 바로 추가
+    known_ids = {movie['the_movie_db_id'] for movie in known_movies}
+    unknown_ids = [movie_id for movie_id in changed_ids if movie_id not in known_ids]
+    details = await asyncio.gather(*[fetch_movie_with_providers(client, movie_id) for movie_id in unknown_ids])
+    new_movies = [movie for movie in details if is_new_provider_movie(movie)]
+    logger.info(f"저장되지 않은 영화 {len(unknown_ids)}개 중 새 공포 영화 {len(new_movies)}개 추가")
+
+    responses = await asyncio.gather(*[
+        client.watch_providers(movie['the_movie_db_id']) for movie in known_movies
+    ])
+    current_providers = {
+        movie['the_movie_db_id']: map_watch_providers(response) for movie, response in zip(known_movies, responses)
+    }
+    current_providers.update({movie['id']: map_watch_providers(movie['watch/providers']) for movie in new_movies})
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            changed_movies = list(known_movies)
+            if new_movies:
+                records = [movie_record(movie) for movie in map_discover_movie_data(new_movies)]
+                await merge_movie_records(conn, records)
+                changed_movies += await conn.fetch(
+                    "SELECT id, the_movie_db_id FROM movie WHERE the_movie_db_id = ANY($1::int[])",
+                    [movie['id'] for movie in new_movies]
+                )
+            if changed_movies:
+                movie_ids, provider_ids = [], []
+                for movie in changed_movies:
+                    for mapped_provider_id in current_providers[movie['the_movie_db_id']]:
+                        movie_ids.append(movie['id'])
+                        provider_ids.append(mapped_provider_id)
+                changed_movie_ids = [movie['id'] for movie in changed_movies]
+                delete_result = await conn.execute('''
+                    DELETE FROM movie_providers mp
+                    WHERE mp.movie_id = ANY($1::int[])
+                      AND mp.the_provider_id = ANY($2::int[])
+                      AND NOT EXISTS (
+                          SELECT 1
+                          FROM unnest($3::int[], $4::int[]) AS c(movie_id, the_provider_id)
+                          WHERE c.movie_id = mp.movie_id AND c.the_provider_id = mp.the_provider_id
+                      )
+                ''', changed_movie_ids, list(PROVIDER_MAPPING.values()), movie_ids, provider_ids)
+                insert_result = await conn.execute('''
+                    INSERT INTO movie_providers (movie_id, the_provider_id)
+                    SELECT movie_id, the_provider_id
+                    FROM unnest($1::int[], $2::int[]) AS c(movie_id, the_provider_id)
+                    ON CONFLICT (movie_id, the_provider_id) DO NOTHING
+                ''', movie_ids, provider_ids)
+                logger.info(f"증분 동기화: 관계 삭제 {delete_result}, 관계 추가 {insert_result}")
+            await save_provider_sync_state(conn, list(PROVIDER_MAPPING.values()), synced_at, full_sync=False)
+
+async def update_all_providers(pool, checkpoints: Optional[CheckpointStore] = None) -> None:
+    logger.info("영화 공급자 정보 업데이트 시작")
+    start_time = time.time()
+    synced_at = datetime.now(timezone.utc)
+    client = get_tmdb_client()
+
+    async with pool.acquire() as conn:
+        sync_state = await load_provider_sync_state(conn)
+
+    if needs_full_sync(sync_state, synced_at):
+        logger.info("전체 동기화 실행")
+        await full_sync_providers(pool, client, synced_at, checkpoints)
+    else:
+        logger.info("변경 피드 기반 증분 동기화 실행")
+        await incremental_sync_providers(pool, client, sync_state, synced_at)
+
     end_time = time.time()
-    logger.info(f"모든 공급자 정보 업데이트 완료. 총 소요 시간: {end_time - start_time:.2f}초")
\ No newline at end of file
+    logger.info(f"모든 공급자 정보 업데이트 완료. 총 소요 시간: {end_time - start_time:.2f}초")
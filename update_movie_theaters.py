@@ -1,79 +1,108 @@
 import asyncio
-from typing import List, Dict, Any
+from typing import List, Dict
 from logging_config import get_logger
-from database import get_db_pool, execute_query, execute_many, execute_transaction
-from functools import lru_cache
+from database import execute_query, execute_many, execute_transaction
+from title_normalizer import normalize_title
+from schema import is_trgm_enabled
+from config import TITLE_TRGM_THRESHOLD
 
 logger = get_logger(__name__)
 
+# normalized_title 인덱스로 정확히 일치하는 영화를 찾는다
+MATCH_EXACT_QUERY = """
+        SELECT s.theater_name, m.id AS movie_id
+        FROM scraped s
+        JOIN movie m ON m.normalized_title = s.normalized_title
+"""
+# 정확히 일치하는 영화가 없는 제목은 pg_trgm 유사도로 가장 가까운 영화를 찾는다
+MATCH_SIMILAR_QUERY = """
+        UNION ALL
+        SELECT s.theater_name, near.id AS movie_id
+        FROM scraped s
+        CROSS JOIN LATERAL (
+            SELECT id
+            FROM movie
+            WHERE normalized_title % s.normalized_title
+              AND similarity(normalized_title, s.normalized_title) >= $3
+            ORDER BY similarity(normalized_title, s.normalized_title) DESC
+            LIMIT 1
+        ) near
+        WHERE NOT EXISTS (
+            SELECT 1 FROM movie m WHERE m.normalized_title = s.normalized_title
+        )
+"""
+
 MAX_DB_CONNECTIONS = 5
 db_semaphore = asyncio.Semaphore(MAX_DB_CONNECTIONS)
 
-@lru_cache(maxsize=None)
-async def find_theater_id(conn, movie_theater_name: str) -> int:
-    query = "SELECT id FROM theaters WHERE name = $1"
-    result = await conn.fetchrow(query, movie_theater_name)
-    return result['id'] if result else None
-
-async def update_theaters_info(cgv_movie_names: List[str], lotte_movie_names: List[str]) -> None:
+async def update_theaters_info(pool, cgv_movie_names: List[str], lotte_movie_names: List[str]) -> Dict[str, int]:
     logger.info("update_theaters_info 시작")
     try:
-        pool = await get_db_pool()
         async with pool.acquire() as conn:
-            for theater_name, movies in [('CGV', cgv_movie_names), ('롯데시네마', lotte_movie_names)]:
-                try:
-                    await insert_unsaved_movie_theater_info(conn, movies, theater_name)
-                    logger.info(f"{theater_name} 영화 정보 업데이트 완료")
-                except Exception as e:
-                    logger.error(f"{theater_name} 영화 정보 업데이트 중 오류 발생: {e}")
+            inserted_counts = await insert_unsaved_movie_theater_info(conn, {
+                'CGV': cgv_movie_names,
+                '롯데시네마': lotte_movie_names,
+            })
         logger.info("update_theaters_info 완료")
+        return inserted_counts
     except Exception as e:
         logger.error(f"update_theaters_info 중 오류 발생: {e}")
+        raise
 
-async def find_movie_info(conn, movie_names: List[str]) -> List[Dict[str, Any]]:
-    query = "SELECT id FROM movie WHERE title = ANY($1)"
-    return await conn.fetch(query, movie_names)
+async def insert_unsaved_movie_theater_info(conn, movie_names_by_theater: Dict[str, List[str]]) -> Dict[str, int]:
+    theater_names, movie_names = [], []
+    for theater_name, names in movie_names_by_theater.items():
+        for normalized_title in {normalize_title(name) for name in names} - {''}:
+            theater_names.append(theater_name)
+            movie_names.append(normalized_title)
 
-async def find_already_saved_movie_theater_info(conn, movie_ids: List[int], theater_id: int) -> List[Dict[str, Any]]:
-    query = """
-    SELECT theaters_id, movie_id 
-    FROM movie_theaters 
-    WHERE movie_id = ANY($1) AND theaters_id = $2
-    """
-    return await conn.fetch(query, movie_ids, theater_id)
+    if not movie_names:
+        logger.info("추가할 영화관 정보가 없습니다.")
+        return {theater_name: 0 for theater_name in movie_names_by_theater}
 
-async def save_movie_theaters_info(conn, movie_infos: List[Dict[str, Any]]) -> None:
-    async with db_semaphore:
-        query = """
+    # 모든 영화관의 (영화관 이름, 정규화한 제목) 쌍을 한 번에 보내 아직 없는 상영 정보만 추가하고,
+    # 영화관별 추가 건수를 같은 문장에서 돌려받는다
+    query = f"""
+    WITH scraped AS (
+        SELECT *
+        FROM unnest($1::text[], $2::text[]) AS s(theater_name, normalized_title)
+    ),
+    matched AS (
+        {MATCH_EXACT_QUERY}
+        {MATCH_SIMILAR_QUERY if is_trgm_enabled() else ''}
+    ),
+    inserted AS (
         INSERT INTO movie_theaters (movie_id, theaters_id)
-        VALUES ($1, $2)
-        """
-        await conn.executemany(query, [(info['movie_id'], info['theaters_id']) for info in movie_infos])
-
-async def get_new_movie_infos(conn, movie_names: List[str], theater_id: int) -> List[Dict[str, Any]]:
-    movie_info = await find_movie_info(conn, movie_names)
-    movie_ids = [i['id'] for i in movie_info]
-    
-    existing_info = await find_already_saved_movie_theater_info(conn, movie_ids, theater_id)
-    existing_movie_ids = [i['movie_id'] for i in existing_info]
-    
-    return [
-        {'theaters_id': theater_id, 'movie_id': movie['id']}
-        for movie in movie_info
-        if movie['id'] not in existing_movie_ids
-    ]
-
-async def insert_unsaved_movie_theater_info(conn, movie_names: List[str], movie_theater_name: str) -> None:
-    theater_id = await find_theater_id(conn, movie_theater_name)
-    
-    if theater_id is None:
-        logger.error(f"영화관 '{movie_theater_name}'을(를) 찾을 수 없습니다.")
-        return
+        SELECT DISTINCT m.movie_id, t.id
+        FROM matched m
+        JOIN theaters t ON t.name = m.theater_name
+        WHERE NOT EXISTS (
+            SELECT 1 FROM movie_theaters mt
+            WHERE mt.movie_id = m.movie_id AND mt.theaters_id = t.id
+        )
+        ON CONFLICT DO NOTHING
+        RETURNING theaters_id
+    )
+    SELECT s.theater_name,
+           t.id AS theater_id,
+           (SELECT count(*) FROM inserted i WHERE i.theaters_id = t.id) AS inserted_count
+    FROM (SELECT DISTINCT theater_name FROM scraped) s
+    LEFT JOIN theaters t ON t.name = s.theater_name
+    """
+    async with db_semaphore:
+        args = [theater_names, movie_names]
+        if is_trgm_enabled():
+            args.append(TITLE_TRGM_THRESHOLD)
+        result = await conn.fetch(query, *args)
 
-    new_movie_infos = await get_new_movie_infos(conn, movie_names, theater_id)
-    
-    if new_movie_infos:
-        await save_movie_theaters_info(conn, new_movie_infos)
-        logger.info(f"{len(new_movie_infos)}개의 새로운 영화를 영화관 ID {theater_id}에 추가했습니다.")
-    else:
-        logger.info(f"영화관 ID {theater_id}에 추가할 새로운 영화가 없습니다.")
\ No newline at end of file
+    inserted_counts = {theater_name: 0 for theater_name in movie_names_by_theater}
+    for row in result:
+        if row['theater_id'] is None:
+            logger.error(f"영화관 '{row['theater_name']}'을(를) 찾을 수 없습니다.")
+            continue
+        inserted_counts[row['theater_name']] = row['inserted_count']
+        if row['inserted_count']:
+            logger.info(f"{row['inserted_count']}개의 새로운 영화를 영화관 ID {row['theater_id']}에 추가했습니다.")
+        else:
+            logger.info(f"영화관 ID {row['theater_id']}에 추가할 새로운 영화가 없습니다.")
+    return inserted_counts
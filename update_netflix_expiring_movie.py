@@ -1,38 +1,32 @@
 import asyncio
+import re
 import time
 import traceback
 from typing import List, Dict, Any, Optional
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import WebDriverException, TimeoutException
 from logging_config import get_logger
-from database import get_db_pool, execute_many
-from config import UNOGS_URL, WAIT_TIME, EXPIRING_BUTTON_INDEX
-from functools import lru_cache
+from chrome_driver import get_driver_pool
+from scraper_workers import run_scraper
+from page_paginator import paginate_table
+from title_matcher import TitleMatcher
+from database import execute_many
+from config import UNOGS_URL, WAIT_TIME, EXPIRING_BUTTON_INDEX, UNOGS_NEXT_PAGE_SELECTOR, UNOGS_MAX_PAGES
 
 logger = get_logger(__name__)
 
-def setup_chrome_driver() -> webdriver.Chrome:
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-gpu')
-    chrome_options.add_argument('--ignore-certificate-errors')
-    chrome_options.add_argument('--ignore-ssl-errors')
-    return webdriver.Chrome(options=chrome_options)
+# 넷플릭스 타이틀 링크(/title/80100172, ?nid=80100172 등)에서 넷플릭스 ID를 찾는다
+NETFLIX_ID_PATTERN = re.compile(r'(?:title/|nid=|netflixid=)(\d+)')
 
-async def update_netflix_expiring_movie() -> Optional[bool]:
+async def update_netflix_expiring_movie(pool) -> bool:
     try:
-        expiring_movies = await find_netflix_expiring_movie()
+        expiring_movies = await run_scraper(find_netflix_expiring_movie)
+        # 만료 예정 목록은 비어 있는 일이 없으므로 빈 결과는 스크래핑 실패로 본다
         if not expiring_movies:
-            logger.info("만료되는 영화가 없습니다.")
-            return False
+            raise RuntimeError("만료 예정 영화를 가져오지 못했습니다.")
 
-        pool = await get_db_pool()
         async with pool.acquire() as conn:
             netflix_horror_mv_en = await find_netflix_english_horror_movie(conn)
             expiring_horror_movies = find_expiring_horror_movies(expiring_movies, netflix_horror_mv_en)
@@ -56,47 +50,63 @@ async def update_netflix_expiring_movie() -> Optional[bool]:
                 logger.error("만료되는 공포 영화를 저장하지 못했습니다.")
                 return False
     except Exception as e:
+        # 스케줄러가 실패로 기록해서 JOB_RETRY_DELAY 뒤에 다시 실행하도록 예외를 그대로 올린다
         logger.error(f"영화 업이트 중 오류 발생: {e}")
         logger.error(traceback.format_exc())
-        return None
+        raise
+
+def parse_netflix_id(links: List[str]) -> Optional[str]:
+    for link in links:
+        match = NETFLIX_ID_PATTERN.search(link or '')
+        if match:
+            return match.group(1)
+    return None
+
+def map_expiring_rows(rows: List[Dict[str, List[str]]]) -> List[Dict[str, str]]:
+    expiring_movies = []
+    seen = set()
+    for row in rows:
+        columns = row['cells']
+        if len(columns) < 2 or not columns[0]:
+            continue
+        key = (columns[0], columns[1])
+        if key in seen:
+            continue
+        seen.add(key)
+        expiring_movies.append({
+            "title": columns[0],
+            "expired_date": columns[1],
+            "netflix_id": parse_netflix_id(row['links'])
+        })
+    return expiring_movies
 
 async def find_netflix_expiring_movie() -> List[Dict[str, str]]:
-    driver = setup_chrome_driver()
     try:
-        await asyncio.to_thread(driver.get, UNOGS_URL)
-        await asyncio.to_thread(WebDriverWait(driver, WAIT_TIME).until, 
-                                EC.presence_of_element_located((By.CSS_SELECTOR, "div.btn-group-vertical")))
-        
-        buttons = await asyncio.to_thread(driver.find_elements, By.CSS_SELECTOR, "div.btn-group-vertical button")
-        await asyncio.to_thread(buttons[EXPIRING_BUTTON_INDEX].click)
-        
-        await asyncio.to_thread(WebDriverWait(driver, WAIT_TIME).until, 
-                                EC.presence_of_element_located((By.CSS_SELECTOR, "table.table")))
+        async with get_driver_pool().driver() as driver:
+            await asyncio.to_thread(driver.get, UNOGS_URL)
+            await asyncio.to_thread(WebDriverWait(driver, WAIT_TIME).until, 
+                                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.btn-group-vertical")))
         
-        rows = await asyncio.to_thread(driver.find_elements, By.CSS_SELECTOR, "table.table tbody tr")
+            buttons = await asyncio.to_thread(driver.find_elements, By.CSS_SELECTOR, "div.btn-group-vertical button")
+            await asyncio.to_thread(buttons[EXPIRING_BUTTON_INDEX].click)
         
-        expiring_movies = []
-        for row in rows:
-            columns = await asyncio.to_thread(row.find_elements, By.TAG_NAME, "td")
-            if len(columns) >= 2:
-                title = await asyncio.to_thread(columns[0].text)
-                expired_date = await asyncio.to_thread(columns[1].text)
-                expiring_movies.append({"title": title, "expired_date": expired_date})
+            await asyncio.to_thread(WebDriverWait(driver, WAIT_TIME).until, 
+                                    EC.presence_of_element_located((By.CSS_SELECTOR, "table.table")))
         
-        return expiring_movies
-    except WebDriverException as e:
-        logger.error(f"웹 드라이버 오류 발생: {e}")
-        return []
+            rows = await paginate_table(driver, "table.table tbody tr", UNOGS_NEXT_PAGE_SELECTOR, UNOGS_MAX_PAGES)
+            expiring_movies = map_expiring_rows(rows)
+            logger.info(f"만료 예정 영화 {len(expiring_movies)}개 조회 완료")
+            return expiring_movies
     except TimeoutException:
         logger.error("페이지 로딩 시간 초과")
-        return []
+        raise
+    except WebDriverException as e:
+        logger.error(f"웹 드라이버 오류 발생: {e}")
+        raise
     except Exception as e:
         logger.error(f"예상치 못한 오류 발생: {e}")
-        return []
-    finally:
-        await asyncio.to_thread(driver.quit)
+        raise
 
-@lru_cache(maxsize=1)
 async def find_netflix_english_horror_movie(conn) -> List[Dict[str, Any]]:
     query = """
     SELECT title, EXTRACT(YEAR FROM release_date) AS release_year, the_movie_db_id
@@ -105,16 +115,18 @@ async def find_netflix_english_horror_movie(conn) -> List[Dict[str, Any]]:
     return await conn.fetch(query)
 
 def find_expiring_horror_movies(expiring_movies: List[Dict[str, str]], netflix_horror_mv_en: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    start_time = time.time()
+    matcher = TitleMatcher(dict(movie) for movie in netflix_horror_mv_en)
     expiring_horror_movies = []
     for expiring_movie in expiring_movies:
-        for horror_movie in netflix_horror_mv_en:
-            if expiring_movie['title'].lower() in horror_movie['title'].lower():
-                expiring_horror_movies.append({
-                    'title': horror_movie['title'],
-                    'expired_date': expiring_movie['expired_date'],
-                    'the_movie_db_id': horror_movie['the_movie_db_id']
-                })
-                break
+        horror_movie = matcher.match(expiring_movie['title'], expiring_movie.get('year'))
+        if horror_movie:
+            expiring_horror_movies.append({
+                'title': horror_movie['title'],
+                'expired_date': expiring_movie['expired_date'],
+                'the_movie_db_id': horror_movie['the_movie_db_id']
+            })
+    logger.info(f"만료 예정 영화 {len(expiring_movies)}개 중 공포 영화 {len(expiring_horror_movies)}개 매칭 (소요 시간: {time.time() - start_time:.2f}초)")
     return expiring_horror_movies
 
 async def save_expiring_horror_movie(conn, expiring_horror_movies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1,4 +1,8 @@
 import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from typing import List
 from logging_config import setup_logging, get_logger
 from functools import partial
 from update_ended_movies import update_ended
@@ -7,64 +11,131 @@ from update_upcoming_movie import update_upcoming_movie
 from update_movie_provider import update_all_providers
 from update_netflix_expiring_movie import update_netflix_expiring_movie
 from find_all_movie_info import get_all_movie_info
+from chrome_driver import close_driver_pool
+from scraper_workers import close_scraper_workers
+from tmdb_client import close_tmdb_client
+from database import get_db_pool, close_db_pool
+from schema import ensure_schema
+from job_dag import JobDAG
+from checkpoint import CheckpointStore
+from job_schedule import load_job_state, save_job_results, due_jobs, seconds_until_next_job
+from config import (
+    DAG_BROWSER_CONCURRENCY, DAG_HTTP_CONCURRENCY, DAG_DB_CONCURRENCY,
+    JOB_RETRY_DELAY, JOB_CATCHUP_JITTER, JOB_SCHEDULE_JITTER
+)
 
 setup_logging()
 logger = get_logger(__name__)
 
-ONE_WEEK = 604800
-MAX_CONCURRENT_TASKS = 3  # 동시에 실행할 수 있는 최대 작업 수
+# 스크래핑 결과는 체크포인트로 저장해서, 뒤 단계가 실패하면 다시 스크래핑하지 않고 재개한다
+# 일부 목록만 가져온 결과는 체크포인트로 남기지 않고, 실행 후 스크래핑을 실패로 기록해서 다시 스크래핑한다
+async def update_all_movie_info(checkpoints: CheckpointStore, saved=None):
+    if saved is not None:
+        return saved['cgv'], saved['lotte'], []
 
-async def update_all_movie_info():
-    return await get_all_movie_info()
+    cgv_movie_names, lotte_movie_names, incomplete_theaters = await get_all_movie_info()
+    if not cgv_movie_names and not lotte_movie_names:
+        raise RuntimeError("영화 정보를 가져오는데 실패했습니다.")
+    if not incomplete_theaters:
+        await checkpoints.save('scrape', {'cgv': cgv_movie_names, 'lotte': lotte_movie_names})
+    return cgv_movie_names, lotte_movie_names, incomplete_theaters
 
-async def run_with_semaphore(semaphore, func, *args):
-    async with semaphore:
-        return await func(*args)
+def build_update_dag(pool, due: List[str], checkpoints: CheckpointStore, saved_scrape=None) -> JobDAG:
+    dag = JobDAG({
+        'browser': DAG_BROWSER_CONCURRENCY,
+        'http': DAG_HTTP_CONCURRENCY,
+        'db': DAG_DB_CONCURRENCY,
+    })
+    if 'scrape' in due:
+        dag.add('scrape', partial(update_all_movie_info, checkpoints, saved_scrape), 'browser')
+        # 영화관/상영 종료 정보는 스크래핑이 끝나는 즉시 시작한다
+        # 일부만 가져온 제목도 상영 정보 추가에는 쓰고, 상영 종료 처리는 목록이 빠진 영화관을 건너뛴다
+        dag.add('theaters_info', lambda scraped: update_theaters_info(pool, scraped[0], scraped[1]), 'db', depends_on=['scrape'])
+        dag.add('ended', lambda scraped: update_ended(pool, *scraped), 'db', depends_on=['scrape'])
+    if 'netflix' in due:
+        dag.add('netflix', partial(update_netflix_expiring_movie, pool), 'browser')
+    if 'upcoming' in due:
+        dag.add('upcoming', partial(update_upcoming_movie, pool), 'http')
+    if 'providers' in due:
+        dag.add('providers', partial(update_all_providers, pool, checkpoints), 'http')
+    return dag
 
-async def update_scheduler():
+# 주기가 된 작업만 실행하고 다음 실행까지 남은 시간(초)을 돌려준다
+async def update_scheduler(pool, catch_up: bool = False) -> float:
     try:
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
-        
-        # 병렬로 실행할 수 있는 작업들을 동시에 시작
-        tasks = [
-            run_with_semaphore(semaphore, update_upcoming_movie),
-            run_with_semaphore(semaphore, update_netflix_expiring_movie),
-            run_with_semaphore(semaphore, update_all_movie_info),
-            run_with_semaphore(semaphore, update_all_providers),
-        ]
+        checkpoints = CheckpointStore(pool)
+        await checkpoints.prune()
+        async with pool.acquire() as conn:
+            state = await load_job_state(conn)
+        due = due_jobs(state, datetime.now(timezone.utc))
+        if not due:
+            return seconds_until_next_job(state, datetime.now(timezone.utc))
 
-        # 모든 작업이 완료될 때까지 기다림
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        if catch_up:
+            # 재시작 직후 밀린 작업이 여러 인스턴스/재시작에서 한꺼번에 몰리지 않도록 분산
+            delay = random.uniform(0, JOB_CATCHUP_JITTER)
+            logger.info(f"밀린 작업 {', '.join(due)}을(를) {delay:.0f}초 후 실행")
+            await asyncio.sleep(delay)
 
-        # 예외 처리 및 결과 추출
-        cgv_movie_names, megabox_movie_names, lotte_movie_names = None, None, None
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.error(f"작업 {tasks[i].__name__} 실행 중 오류 발생: {result}")
-            elif i == 2:  # update_all_movie_info의 결과
-                cgv_movie_names, lotte_movie_names = result
+        # 스크래핑은 끝났지만 영화관/상영 종료 업데이트가 실패한 실행이 있으면 저장된 결과로 이어서 실행
+        saved_scrape = await checkpoints.load('scrape') if 'scrape' in due else None
+        if saved_scrape is not None:
+            logger.info("완료되지 않은 스크래핑 체크포인트가 있어 영화관 업데이트를 재개합니다.")
 
-        if cgv_movie_names is None or lotte_movie_names is None:
-            logger.error("영화 정보를 가져오는데 실패했습니다.")
-            return
+        dag = build_update_dag(pool, due, checkpoints, saved_scrape)
+        started_at = time.monotonic()
+        results = await dag.run()
+        dag.report(results, started_at)
 
-        # 순차적으로 실행해야 하는 작업들
-        await run_with_semaphore(semaphore, update_theaters_info, cgv_movie_names, lotte_movie_names)
-        await run_with_semaphore(semaphore, update_ended, cgv_movie_names, lotte_movie_names)
+        if all(name in results and results[name].status == 'success' for name in ('theaters_info', 'ended')):
+            await checkpoints.clear(['scrape'])
 
-        logger.info("모든 업데이트 작업이 완료되었습니다.")
-    except Exception as e:
-        logger.exception(f"업데이트 중 오류 발생: {e}")
+        scrape = results.get('scrape')
+        if scrape and scrape.status == 'success' and scrape.result[2]:
+            # 일부 목록만 가져온 스크래핑은 성공으로 기록하지 않아 JOB_RETRY_DELAY 뒤에 다시 실행된다
+            results['scrape'] = scrape._replace(status='failed')
+
+        # 체크포인트로 재개한 스크래핑은 새로 스크래핑한 것이 아니므로 마지막 성공 시각을 갱신하지 않는다
+        recorded = {name: result for name, result in results.items() if not (name == 'scrape' and saved_scrape is not None)}
+        async with pool.acquire() as conn:
+            await save_job_results(conn, recorded, datetime.now(timezone.utc))
+            state = await load_job_state(conn)
+
+        failed = [name for name, result in results.items() if result.status != 'success']
+        if failed:
+            logger.error(f"완료하지 못한 작업: {', '.join(failed)}")
+        else:
+            logger.info("모든 업데이트 작업이 완료되었습니다.")
+        return seconds_until_next_job(state, datetime.now(timezone.utc))
+    finally:
+        # 다음 실행까지 브라우저와 HTTP 연결을 유지할 필요가 없으므로 정리
+        await close_scraper_workers()
+        await close_driver_pool()
+        await close_tmdb_client()
+        pool.log_metrics()
 
 async def main():
-    while True:
-        try:
-            await update_scheduler()
-            await asyncio.sleep(ONE_WEEK)
-        except Exception as e:
-            logger.exception(f"예상치 못한 오류 발생: {e}")
-            logger.info("한 시간 후 다시 실행")
-            await asyncio.sleep(3600)
+    # DB 연결 풀은 프로세스당 하나만 만들고 작업들에 넘겨 공유하며, 종료할 때만 닫는다
+    catch_up = True
+    schema_ready = False
+    try:
+        while True:
+            try:
+                pool = await get_db_pool()
+                if not schema_ready:
+                    await ensure_schema(pool)
+                    schema_ready = True
+                wait = await update_scheduler(pool, catch_up)
+                catch_up = False
+                wait += random.uniform(0, JOB_SCHEDULE_JITTER)
+                logger.info(f"다음 작업까지 {wait / 3600:.1f}시간 대기")
+                await asyncio.sleep(wait)
+            except Exception as e:
+                logger.exception(f"예상치 못한 오류 발생: {e}")
+                logger.info(f"{JOB_RETRY_DELAY}초 후 다시 실행")
+                await asyncio.sleep(JOB_RETRY_DELAY)
+    finally:
+        await close_db_pool()
 
 if __name__ == '__main__':
     asyncio.run(main())
@@ -1,18 +1,15 @@
 import asyncio
-import aiohttp
-from functools import wraps, lru_cache
+from functools import wraps
 import time
 from typing import List, Dict, Any, Tuple
 from logging_config import get_logger
-from database import get_db_pool, execute_many, close_db_pool
-from config import THE_MOVIE_DB_URL, THE_MOVIE_DB_TOKEN, MAX_CONCURRENT_REQUESTS
+from database import execute_many
+from title_normalizer import normalize_title
+from content_hash import movie_content_hash
+from tmdb_client import TMDBClient, get_tmdb_client
 
 logger = get_logger(__name__)
 
-semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
-
-print(THE_MOVIE_DB_TOKEN)
-
 def retry(max_tries=3, delay_seconds=1):
     def decorator_retry(func):
         @wraps(func)
@@ -30,36 +27,19 @@ def retry(max_tries=3, delay_seconds=1):
         return wrapper_retry
     return decorator_retry
 
-@lru_cache(maxsize=100)
-async def get_existing_titles(conn, titles: Tuple[str]) -> List[str]:
-    if not isinstance(titles, tuple):
-        logger.error(f"Unexpected type for titles: {type(titles)}")
-        logger.error(f"Content of titles: {titles[:1000]}")  # 처음 1000자만 로그
-        raise TypeError("titles must be a tuple")
-
-    query = "SELECT title FROM movie WHERE title = ANY($1)"
-    result = await conn.fetch(query, list(titles))
-    return [row['title'] for row in result]
-
-async def update_upcoming_movie():
-    headers = {
-        "accept": "application/json",
-        "Authorization": "Bearer " + THE_MOVIE_DB_TOKEN
-    }
+async def update_upcoming_movie(pool):
     try:
-        async with aiohttp.ClientSession() as session:
-            upcoming_movies = await get_upcoming_movie_all_pages(session, THE_MOVIE_DB_URL, headers)
+        upcoming_movies = await get_upcoming_movie_all_pages(get_tmdb_client())
         
         logger.info(f"Retrieved {len(upcoming_movies)} upcoming movies")
         
-        pool = await get_db_pool()
         async with pool.acquire() as conn:
             await insert_upcoming_movie_info(conn, upcoming_movies)
         logger.info(f"{len(upcoming_movies)}개의 영화 정보가 업데이트되었습니다.")
     except Exception as e:
+        # 스케줄러가 실패로 기록해서 JOB_RETRY_DELAY 뒤에 다시 실행하도록 예외를 그대로 올린다
         logger.exception(f"예상치 못한 오류 발생: {e}")
-    finally:
-        await close_db_pool()
+        raise
 
 @retry(max_tries=3, delay_seconds=2)
 async def insert_upcoming_movie_info(conn, upcoming_movies: List[Any]):
@@ -80,12 +60,12 @@ async def insert_upcoming_movie_info(conn, upcoming_movies: List[Any]):
         logger.error(f"Unexpected data type in upcoming_movies: {type(upcoming_movies[0])}")
         return
 
-    existing_titles = await get_existing_titles(conn, upcoming_movies)
+    existing_titles = set(await get_existing_titles(conn, upcoming_movies))
     
     if isinstance(upcoming_movies[0], dict):
-        new_movies = [movie for movie in upcoming_movies if movie['title'] not in existing_titles]
+        new_movies = [movie for movie in upcoming_movies if normalize_title(movie['title']) not in existing_titles]
     else:
-        new_movies = [movie for movie in upcoming_movies if movie not in existing_titles]
+        new_movies = [movie for movie in upcoming_movies if normalize_title(movie) not in existing_titles]
     
     if new_movies:
         await insert_new_movies(conn, new_movies)
@@ -104,54 +84,45 @@ async def get_existing_titles(conn, upcoming_movies: List[Any]) -> List[str]:
         logger.error(f"Unexpected data type in upcoming_movies: {type(upcoming_movies[0])}")
         return []
 
-    query = "SELECT title FROM movie WHERE title = ANY($1)"
-    result = await conn.fetch(query, titles)
-    return [row['title'] for row in result]
+    query = "SELECT normalized_title FROM movie WHERE normalized_title = ANY($1)"
+    result = await conn.fetch(query, [normalize_title(title) for title in titles])
+    return [row['normalized_title'] for row in result]
 
 async def insert_new_movies(conn, new_movies: List[Dict[str, Any]]):
     insert_query = """
-    INSERT INTO movie (title, release_date, overview, poster_path, the_movie_db_id, is_theatrical_release)
-    VALUES ($1, $2, $3, $4, $5, $6)
+    INSERT INTO movie (title, release_date, overview, poster_path, the_movie_db_id, is_theatrical_release, normalized_title, content_hash)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
     """
     movie_data = [
-        (m['title'], m['release_date'], m['overview'], m['poster_path'], m['the_movie_db_id'], m['is_theatrical_release'])
+        (m['title'], m['release_date'], m['overview'], m['poster_path'], m['the_movie_db_id'], m['is_theatrical_release'],
+         normalize_title(m['title']), movie_content_hash(m))
         for m in new_movies
     ]
     await conn.executemany(insert_query, movie_data)
 
 @retry(max_tries=3, delay_seconds=2)
-async def get_upcoming_movie_all_pages(session: aiohttp.ClientSession, url: str, headers: Dict[str, str]) -> List[Dict[str, Any]]:
-    current_page, total_pages, upcoming_movies = await get_first_page_upcoming_movie(session, url, headers)
-    tasks = [get_page_data(session, f"{url}&page={page}", headers) for page in range(current_page + 1, total_pages + 1)]
+async def get_upcoming_movie_all_pages(client: TMDBClient) -> List[Dict[str, Any]]:
+    current_page, total_pages, upcoming_movies = await get_first_page_upcoming_movie(client)
+    tasks = [client.upcoming(page) for page in range(current_page + 1, total_pages + 1)]
     results = await asyncio.gather(*tasks, return_exceptions=True)
+    failed_pages = 0
     for result in results:
         if isinstance(result, Exception):
             logger.error(f"Error fetching page: {result}")
+            failed_pages += 1
         elif isinstance(result, dict) and 'results' in result:
             upcoming_movies += map_upcoming_movie_data(result['results'])
         else:
             logger.error(f"Unexpected result format: {result}")
+            failed_pages += 1
+    # 일부 페이지만 받은 결과를 성공으로 기록하지 않도록 실패로 처리한다
+    if failed_pages:
+        raise RuntimeError(f"개봉 예정작 {failed_pages}개 페이지를 가져오지 못했습니다.")
     logger.info(f"Total upcoming movies: {len(upcoming_movies)}")
     return upcoming_movies
 
-async def get_page_data(session: aiohttp.ClientSession, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
-    async with semaphore:
-        try:
-            async with session.get(url, headers=headers, timeout=30) as response:
-                data = await response.json()
-                if not isinstance(data, dict):
-                    logger.error(f"Unexpected data format from API: {data}")
-                return data
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout while fetching data from {url}")
-            return {}
-        except Exception as e:
-            logger.error(f"Error fetching data from {url}: {e}")
-            return {}
-
-async def get_first_page_upcoming_movie(session: aiohttp.ClientSession, url: str, headers: Dict[str, str]) -> Tuple[int, int, List[Dict[str, Any]]]:
-    async with session.get(url, headers=headers) as response:
-        data = await response.json()
+async def get_first_page_upcoming_movie(client: TMDBClient) -> Tuple[int, int, List[Dict[str, Any]]]:
+    data = await client.upcoming(1)
     current_page = data['page']
     total_pages = data['total_pages']
     upcoming_movies = map_upcoming_movie_data(data['results'])